@@ -0,0 +1,38 @@
+"""Gunicorn configuration for the production profile.
+
+Run with ``gunicorn`` from the project root. The default uvicorn worker
+serves the ASGI application, so the async endpoints and the seat
+availability stream work. Set GUNICORN_WORKER_CLASS=gthread (and
+WSGI_APP=train_station_api.wsgi:application) for a sync WSGI deployment.
+
+The workers share the Redis server given by CACHE_URL, both as cache and
+as the channel that carries seat availability changes to the streams of
+every worker.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = os.environ.get("WSGI_APP", "train_station_api.asgi:application")
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+worker_class = os.environ.get(
+    "GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker"
+)
+workers = int(
+    os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+)
+# Only used by the gthread worker.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth of the in-process
+# caches and indexes.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
@@ -6,7 +6,10 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "train_station_api.settings")
+    settings_module = "train_station_api.settings"
+    if sys.argv[1:2] == ["test"]:
+        settings_module = "train_station_api.settings_test"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -9,6 +9,8 @@ from train_station.models import (
     Station,
     Train,
     TrainType,
+    SeatHold,
+    RouteDailyStats,
 )
 
 
@@ -51,3 +53,13 @@ class TrainAdmin(admin.ModelAdmin):
 @admin.register(TrainType)
 class TrainTypeAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    pass
+
+
+@admin.register(RouteDailyStats)
+class RouteDailyStatsAdmin(admin.ModelAdmin):
+    pass
@@ -0,0 +1,110 @@
+"""Daily occupancy aggregates per route.
+
+A ``RouteDailyStats`` row sums up the journeys of one route departing on
+one day (in ``TIME_ZONE``): their number, seats and sold tickets. The
+rows are computed from the denormalized ``Journey.tickets_sold``
+counters, never by joining ``Ticket``.
+
+Selling or returning a ticket, saving a journey and changing its crew
+all move ``Journey.updated_at``, so a refresh only recomputes the route
+days of journeys updated since the newest one already aggregated, minus
+``ROUTE_STATS_REFRESH_OVERLAP`` seconds for transactions that committed
+late. Deleted journeys and journeys moved to another route or day are
+only removed from their old row by a rebuild.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from train_station.models import Journey, RouteDailyStats
+
+BATCH_SIZE = 1000
+STATS_FIELDS = ("journeys", "seats", "tickets_sold", "journeys_updated_at")
+
+
+def aggregate(journeys):
+    return (
+        journeys.annotate(date=TruncDate("departure_time"))
+        .order_by()
+        .values("route", "date")
+        .annotate(
+            journeys=Count("id"),
+            seats=Sum(F("train__cargo_num") * F("train__places_in_cargo")),
+            tickets_sold=Sum("tickets_sold"),
+            journeys_updated_at=Max("updated_at"),
+        )
+    )
+
+
+def to_stats(row) -> RouteDailyStats:
+    return RouteDailyStats(
+        route_id=row["route"],
+        date=row["date"],
+        **{name: row[name] for name in STATS_FIELDS},
+    )
+
+
+def start_of(day) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def rebuild_route_daily_stats() -> int:
+    """Replace every row from scratch. Returns the number of rows."""
+    with transaction.atomic():
+        RouteDailyStats.objects.all().delete()
+        rows = RouteDailyStats.objects.bulk_create(
+            (
+                to_stats(row)
+                for row in aggregate(Journey.objects.all()).iterator()
+            ),
+            batch_size=BATCH_SIZE,
+        )
+    return len(rows)
+
+
+def refresh_route_daily_stats() -> int:
+    """Recompute the route days of recently updated journeys.
+
+    Rebuilds everything when there are no rows yet. Returns the number of
+    written rows.
+    """
+    watermark = RouteDailyStats.objects.aggregate(
+        latest=Max("journeys_updated_at")
+    )["latest"]
+    if watermark is None:
+        return rebuild_route_daily_stats()
+
+    since = watermark - timedelta(seconds=settings.ROUTE_STATS_REFRESH_OVERLAP)
+    changed = set(
+        Journey.objects.filter(updated_at__gt=since)
+        .annotate(date=TruncDate("departure_time"))
+        .values_list("route", "date")
+        .distinct()
+    )
+    if not changed:
+        return 0
+
+    dates = [date for _, date in changed]
+    journeys = Journey.objects.filter(
+        route__in={route for route, _ in changed},
+        departure_time__gte=start_of(min(dates)),
+        departure_time__lt=start_of(max(dates) + timedelta(days=1)),
+    )
+    rows = [
+        to_stats(row)
+        for row in aggregate(journeys)
+        if (row["route"], row["date"]) in changed
+    ]
+    RouteDailyStats.objects.bulk_create(
+        rows,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["route", "date"],
+        update_fields=STATS_FIELDS,
+    )
+    return len(rows)
@@ -0,0 +1,162 @@
+"""Async read-only endpoints for journeys, stations and routes.
+
+They reuse the querysets, filter backends and pagination settings of the
+regular viewsets, so the responses are the same, but every query goes
+through Django's async ORM. Under ASGI one worker keeps serving other
+requests while a query or a slow client is pending.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from train_station.fast_json import FastJSONRenderer
+from train_station.pagination import (
+    KeysetPagination,
+    OptionalCountLimitOffsetPagination,
+)
+from train_station.serializers import (
+    StationSerializer,
+    RouteListSerializer,
+    RouteDetailSerializer,
+    JourneyListRows,
+    JourneyDetailSerializer,
+)
+from train_station.views import StationViewSet, RouteViewSet, JourneyViewSet
+
+
+def render(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        content_type="application/json",
+        status=status_code,
+    )
+
+
+def get_view(viewset_class, request, action, **kwargs):
+    return viewset_class(
+        request=Request(request),
+        action=action,
+        args=(),
+        kwargs=kwargs,
+        format_kwarg=None,
+    )
+
+
+async def serialize(view, serializer_class, instance, many=False):
+    serializer = serializer_class(
+        instance, many=many, context=view.get_serializer_context()
+    )
+    if hasattr(serializer, "adata"):
+        return await serializer.adata()
+    return serializer.data
+
+
+async def fetch_page(view, queryset):
+    """Async counterpart of ``paginator.paginate_queryset``.
+
+    Supports limit/offset pages and ``?count=false``; cursor pages are
+    only served by the synchronous endpoints.
+    """
+    paginator = view.paginator
+    request = view.request
+    if isinstance(paginator, KeysetPagination):
+        if paginator.use_cursor(request):
+            raise ValidationError(
+                {"detail": "Cursor pagination is not available here."}
+            )
+        paginator.cursor_paginator = None
+
+    paginator.request = request
+    paginator.limit = paginator.get_limit(request)
+    paginator.offset = paginator.get_offset(request)
+    end = paginator.offset + paginator.limit
+
+    if isinstance(
+        paginator, OptionalCountLimitOffsetPagination
+    ) and paginator.skip_count(request):
+        paginator.count = None
+        rows = [obj async for obj in queryset[paginator.offset : end + 1]]
+        paginator.has_next = len(rows) > paginator.limit
+        return rows[: paginator.limit]
+
+    paginator.count = await queryset.acount()
+    return [obj async for obj in queryset[paginator.offset : end]]
+
+
+async def list_response(request, viewset_class, serializer_class):
+    view = get_view(viewset_class, request, "list")
+    try:
+        # Filter validation may look up model choices, e.g. ``?route=``.
+        queryset = await sync_to_async(view.filter_queryset)(
+            view.get_queryset()
+        )
+        if (
+            view.paginator is None
+            or view.paginator.get_limit(view.request) is None
+        ):
+            objects = [obj async for obj in queryset]
+            data = await serialize(view, serializer_class, objects, many=True)
+            return render(data)
+        page = await fetch_page(view, queryset)
+    except ValidationError as error:
+        return render(error.detail, status.HTTP_400_BAD_REQUEST)
+
+    data = await serialize(view, serializer_class, page, many=True)
+    return render(view.paginator.get_paginated_response(data).data)
+
+
+async def detail_response(
+    request, viewset_class, serializer_class, pk, prefetch=()
+):
+    view = get_view(viewset_class, request, "retrieve", pk=pk)
+    queryset = view.get_queryset().prefetch_related(*prefetch)
+    try:
+        instance = await aget_object_or_404(queryset, pk=pk)
+    except Http404:
+        return render({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+    return render(await serialize(view, serializer_class, instance))
+
+
+@require_safe
+async def journey_list(request):
+    return await list_response(request, JourneyViewSet, JourneyListRows)
+
+
+@require_safe
+async def journey_detail(request, pk):
+    return await detail_response(
+        request,
+        JourneyViewSet,
+        JourneyDetailSerializer,
+        pk,
+        prefetch=("tickets",),
+    )
+
+
+@require_safe
+async def station_list(request):
+    return await list_response(request, StationViewSet, StationSerializer)
+
+
+@require_safe
+async def station_detail(request, pk):
+    return await detail_response(
+        request, StationViewSet, StationSerializer, pk
+    )
+
+
+@require_safe
+async def route_list(request):
+    return await list_response(request, RouteViewSet, RouteListSerializer)
+
+
+@require_safe
+async def route_detail(request, pk):
+    return await detail_response(
+        request, RouteViewSet, RouteDetailSerializer, pk
+    )
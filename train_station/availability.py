@@ -0,0 +1,279 @@
+"""Server-sent events with seat availability changes of journeys.
+
+Every committed ticket change publishes the ids of the touched journeys.
+With ``AVAILABILITY_REDIS_URL`` set they go through a Redis channel that
+every worker process listens to, so a stream sees the changes made by all
+workers; without it they stay in the process. In each process a broker
+fans the current availability of the watched journeys out to the
+listening streams, so watchers never poll the database themselves.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse, StreamingHttpResponse
+
+from train_station.models import Journey
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "train-station:availability"
+
+
+class Subscription:
+    """Latest availability per journey waiting to be sent to one client.
+
+    Updates are coalesced, so a slow client only ever gets the newest
+    value of each journey instead of an ever growing backlog.
+    """
+
+    def __init__(self, journey_ids, loop):
+        self.journey_ids = frozenset(journey_ids)
+        self.loop = loop
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def push(self, changes):
+        self.pending.update(changes)
+        self.ready.set()
+
+    async def get(self, timeout):
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self.ready.clear()
+        changes, self.pending = self.pending, {}
+        return changes
+
+
+class AvailabilityBroker:
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, journey_ids) -> Subscription:
+        subscription = Subscription(journey_ids, asyncio.get_running_loop())
+        with self._lock:
+            for journey_id in subscription.journey_ids:
+                self._subscriptions[journey_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription) -> None:
+        with self._lock:
+            for journey_id in subscription.journey_ids:
+                listeners = self._subscriptions.get(journey_id)
+                if listeners is not None:
+                    listeners.discard(subscription)
+                    if not listeners:
+                        del self._subscriptions[journey_id]
+
+    def watched(self, journey_ids) -> list[int]:
+        with self._lock:
+            return [pk for pk in journey_ids if pk in self._subscriptions]
+
+    def publish(self, changes) -> None:
+        """Send ``{journey_id: tickets_available}`` to the listeners.
+
+        Safe to call from any thread; delivery happens on each
+        subscriber's event loop.
+        """
+        with self._lock:
+            subscriptions = {
+                subscription
+                for journey_id in changes
+                for subscription in self._subscriptions.get(journey_id, ())
+            }
+        for subscription in subscriptions:
+            relevant = {
+                journey_id: available
+                for journey_id, available in changes.items()
+                if journey_id in subscription.journey_ids
+            }
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.push, relevant
+                )
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+
+broker = AvailabilityBroker()
+
+
+class ChangeRelay:
+    """Carries changed journey ids between worker processes.
+
+    ``start`` subscribes the process to the Redis channel once, from a
+    daemon thread that hands every received message to ``deliver``.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def client(self):
+        import redis
+
+        with self._client_lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(
+                    settings.AVAILABILITY_REDIS_URL
+                )
+            return self._client
+
+    def publish(self, journey_ids) -> None:
+        self.client().publish(CHANNEL, json.dumps(sorted(journey_ids)))
+
+    def start(self) -> None:
+        """Subscribe this process, blocking until the channel is joined."""
+        client = self.client()
+        with self._listener_lock:
+            if self._listener is not None:
+                return
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            self._listener = threading.Thread(
+                target=self.listen,
+                args=(pubsub,),
+                name="availability-relay",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def listen(self, pubsub) -> None:
+        import redis
+
+        while True:
+            try:
+                # listen() reconnects and joins the channel again after a
+                # connection error; changes made meanwhile are lost.
+                for message in pubsub.listen():
+                    self.receive(message)
+                    close_old_connections()
+            except redis.ConnectionError:
+                logger.warning("Availability channel lost, reconnecting")
+                time.sleep(1)
+
+    def receive(self, message) -> None:
+        try:
+            deliver(json.loads(message["data"]))
+        except Exception:
+            logger.exception("Could not deliver availability changes")
+
+
+relay = ChangeRelay()
+
+
+def publish_availability(journey_ids) -> None:
+    """Announce that the availability of the journeys changed."""
+    if not settings.AVAILABILITY_REDIS_URL:
+        deliver(journey_ids)
+        return
+    try:
+        relay.publish(journey_ids)
+    except Exception:
+        # Runs after the commit: a lost announcement must not fail the
+        # request that made the change.
+        logger.exception("Could not publish availability changes")
+
+
+def deliver(journey_ids) -> None:
+    """Send the current availability of the journeys watched here."""
+    watched = broker.watched(journey_ids)
+    if not watched:
+        return
+    broker.publish(
+        {
+            journey.pk: journey.tickets_available
+            for journey in Journey.objects.filter(
+                pk__in=watched
+            ).select_related("train")
+        }
+    )
+
+
+def format_events(changes) -> str:
+    return "".join(
+        "event: availability\n"
+        f"data: {json.dumps({'journey': pk, 'tickets_available': value})}"
+        "\n\n"
+        for pk, value in sorted(changes.items())
+    )
+
+
+class AvailabilityEvents:
+    """Async iterator of the events of one stream.
+
+    Django calls ``close()`` once the response is finished or the client
+    disconnects, which drops the subscription.
+    """
+
+    def __init__(self, subscription, snapshot):
+        self.subscription = subscription
+        self.snapshot = snapshot
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.snapshot is not None:
+            snapshot, self.snapshot = self.snapshot, None
+            return format_events(snapshot)
+        changes = await self.subscription.get(
+            settings.AVAILABILITY_STREAM_KEEPALIVE
+        )
+        return format_events(changes) if changes else ": keepalive\n\n"
+
+    def close(self):
+        broker.unsubscribe(self.subscription)
+
+
+async def journey_availability_stream(request):
+    try:
+        journey_ids = {
+            int(pk) for pk in request.GET.get("journeys", "").split(",") if pk
+        }
+    except ValueError:
+        journey_ids = set()
+    if not (0 < len(journey_ids) <= settings.AVAILABILITY_STREAM_MAX_JOURNEYS):
+        return JsonResponse(
+            {
+                "detail": "Pass 1 to "
+                f"{settings.AVAILABILITY_STREAM_MAX_JOURNEYS} "
+                "comma separated journey ids in ?journeys=."
+            },
+            status=400,
+        )
+
+    if settings.AVAILABILITY_REDIS_URL:
+        await sync_to_async(relay.start, thread_sensitive=False)()
+    # Subscribe before reading the snapshot so no change falls in between.
+    subscription = broker.subscribe(journey_ids)
+    try:
+        snapshot = {
+            journey.pk: journey.tickets_available
+            async for journey in Journey.objects.filter(
+                pk__in=journey_ids
+            ).select_related("train")
+        }
+    except BaseException:
+        broker.unsubscribe(subscription)
+        raise
+
+    response = StreamingHttpResponse(
+        AvailabilityEvents(subscription, snapshot),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,118 @@
+"""Response cache for the nearly static reference-data viewsets.
+
+Cached responses are keyed by the versions of the models they depend on;
+``post_save``/``post_delete`` signals bump a model's version once the
+transaction commits, so stale entries are simply never read again and
+expire on their own.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from train_station.replicas import cache_timeout
+
+KEY_PREFIX = "response-cache"
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(model) -> str:
+    return f"{KEY_PREFIX}:version:{model._meta.label_lower}"
+
+
+def get_versions(models) -> list[int]:
+    cache = get_response_cache()
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # A version lost to eviction restarts from the current time,
+            # never from a value an old cached response was stored under.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model) -> None:
+    cache = get_response_cache()
+    try:
+        cache.incr(version_key(model))
+    except ValueError:
+        cache.set(version_key(model), time.time_ns(), timeout=None)
+
+
+def record_lookup(hit: bool) -> None:
+    cache = get_response_cache()
+    key = f"{KEY_PREFIX}:{'hits' if hit else 'misses'}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_stats() -> dict:
+    cache = get_response_cache()
+    return {
+        "hits": cache.get(f"{KEY_PREFIX}:hits", 0),
+        "misses": cache.get(f"{KEY_PREFIX}:misses", 0),
+    }
+
+
+def reset_stats() -> None:
+    get_response_cache().delete_many(
+        [f"{KEY_PREFIX}:hits", f"{KEY_PREFIX}:misses"]
+    )
+
+
+class CachedResponseMixin:
+    """Cache ``list``/``retrieve`` response data of a viewset.
+
+    ``cache_dependencies`` lists the models, besides the viewset's own,
+    whose changes affect the serialized output.
+    """
+
+    cache_dependencies = ()
+
+    def get_cache_key(self, request) -> str:
+        models = (self.queryset.model, *self.cache_dependencies)
+        parts = [
+            self.basename,
+            self.action,
+            sorted(self.kwargs.items()),
+            sorted(request.query_params.lists()),
+            request.get_host(),
+            request.accepted_renderer.format,
+            get_versions(models),
+        ]
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+        return f"{KEY_PREFIX}:{digest}"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_response_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        record_lookup(data is not None)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                key,
+                response.data,
+                cache_timeout(settings.RESPONSE_CACHE_TIMEOUT),
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
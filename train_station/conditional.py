@@ -0,0 +1,121 @@
+"""Conditional GET (ETag / Last-Modified) support for viewsets.
+
+Validators are computed from cheap sources — per-journey counters and
+the reference-data versions kept by ``train_station.cache`` — so a
+``304 Not Modified`` skips both the main query and the serializer.
+"""
+
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from train_station.cache import get_versions
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Crew,
+    Journey,
+)
+
+
+def make_etag(*parts) -> str:
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """Answer ``list``/``retrieve`` with 304 when the client is current.
+
+    Subclasses implement ``get_validators(request)`` returning an
+    ``(etag, last_modified)`` pair; either may be ``None``.
+    """
+
+    def get_validators(self, request):
+        raise NotImplementedError
+
+    def request_signature(self, request):
+        return (
+            self.action,
+            sorted(self.kwargs.items()),
+            sorted(request.query_params.lists()),
+            request.accepted_renderer.format,
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if etag is None and last_modified is None:
+            return handler(request, *args, **kwargs)
+
+        timestamp = last_modified.timestamp() if last_modified else None
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if not_modified is not None:
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            if etag:
+                response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = last_modified.strftime(
+                    "%a, %d %b %Y %H:%M:%S GMT"
+                )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class JourneyConditionalGetMixin(ConditionalGetMixin):
+    """Journey validators: ``updated_at`` and the ``Journey`` cache version
+    both move on every save, crew change and sold-seat counter change.
+
+    Only an ETag is sent: a renamed station or train changes the
+    representation without touching ``updated_at``, so a Last-Modified
+    date taken from it would answer ``If-Modified-Since`` with a false 304.
+    """
+
+    reference_models = (TrainType, Train, Station, Route, Crew)
+
+    def get_validators(self, request):
+        versions = get_versions(self.reference_models)
+        if self.action == "retrieve":
+            try:
+                state = (
+                    Journey.objects.filter(pk=self.kwargs[self.lookup_field])
+                    .values_list("tickets_sold", "updated_at")
+                    .first()
+                )
+            except (TypeError, ValueError, ValidationError):
+                # Malformed pk: let ``retrieve`` answer 404.
+                state = None
+            if state is None:
+                return None, None
+            etag = make_etag(self.request_signature(request), state, versions)
+            return etag, None
+
+        # Lists use the global journey version instead of an aggregate,
+        # which would cost as much as the COUNT(*) pagination can skip.
+        etag = make_etag(
+            self.request_signature(request),
+            get_versions((Journey,)),
+            versions,
+        )
+        return etag, None
+
+
+class RouteConditionalGetMixin(ConditionalGetMixin):
+    def get_validators(self, request):
+        versions = get_versions((Route, Station))
+        return make_etag(self.request_signature(request), versions), None
@@ -0,0 +1,124 @@
+"""Streaming CSV and NDJSON export of sold tickets with their orders.
+
+Rows are read with ``QuerySet.iterator(chunk_size)``, which uses a
+server-side cursor on PostgreSQL, and every fetched chunk is encoded and
+sent while the response is going out. Memory use does not depend on the
+number of tickets, and the CSV header is sent before the query runs.
+
+Django's ASGI handler would collect a synchronous body into a list before
+sending it, so under ASGI the chunks are pulled one at a time through
+``sync_to_async`` instead.
+"""
+
+import csv
+import io
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.negotiation import BaseContentNegotiation
+
+from train_station.fast_json import FastJSONRenderer
+from train_station.models import Ticket
+from train_station.timetable_import import chunked
+
+COLUMNS = {
+    "order_id": "order_id",
+    "order_created_at": "order__created_at",
+    "user_email": "order__user__email",
+    "ticket_id": "id",
+    "cargo": "cargo",
+    "seat": "seat",
+    "journey_id": "journey_id",
+    "departure_time": "journey__departure_time",
+    "arrival_time": "journey__arrival_time",
+    "source": "journey__route__source__name",
+    "destination": "journey__route__destination__name",
+    "distance": "journey__route__distance",
+    "train": "journey__train__name",
+    "train_type": "journey__train__train_type__name",
+}
+
+
+def export_tickets(created_after=None, created_before=None):
+    """One row per ticket, ordered by order, as ``values_list`` tuples."""
+    tickets = Ticket.objects.all()
+    if created_after:
+        tickets = tickets.filter(order__created_at__date__gte=created_after)
+    if created_before:
+        tickets = tickets.filter(order__created_at__date__lte=created_before)
+    return tickets.order_by("order_id", "id").values_list(*COLUMNS.values())
+
+
+def csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    yield buffer.getvalue()
+    for chunk in chunked(rows, settings.EXPORT_CHUNK_SIZE):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+def ndjson_lines(rows):
+    renderer = FastJSONRenderer()
+    for chunk in chunked(rows, settings.EXPORT_CHUNK_SIZE):
+        yield b"".join(
+            renderer.render(dict(zip(COLUMNS, row))) + b"\n" for row in chunk
+        )
+
+
+FORMATS = {
+    "csv": (csv_lines, "text/csv"),
+    "ndjson": (ndjson_lines, "application/x-ndjson"),
+}
+
+
+async def pull_in_thread(iterator):
+    """Async generator over a sync one, advanced one item per thread hop.
+
+    ``sync_to_async`` is thread sensitive, so the cursor stays on the
+    connection of the thread that opened it.
+    """
+    done = object()
+    pull = sync_to_async(next)
+    try:
+        while (item := await pull(iterator, done)) is not done:
+            yield item
+    finally:
+        await sync_to_async(iterator.close)()
+
+
+def streaming_export(
+    tickets, export_format, asynchronous=False
+) -> StreamingHttpResponse:
+    lines, content_type = FORMATS[export_format]
+    rows = tickets.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    content = lines(rows)
+    if asynchronous:
+        content = pull_in_thread(content)
+    return StreamingHttpResponse(
+        content,
+        content_type=content_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="tickets.{export_format}"'
+            )
+        },
+    )
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Use the view's first renderer whatever the client accepts.
+
+    Exports are not rendered by DRF, so an ``Accept: text/csv`` header
+    must not fail negotiation; errors are still rendered as JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
@@ -0,0 +1,42 @@
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django.utils import timezone
+
+from train_station.models import Journey, RouteDailyStats
+
+
+class JourneyFilter(django_filters.FilterSet):
+    source = django_filters.NumberFilter(field_name="route__source")
+    destination = django_filters.NumberFilter(field_name="route__destination")
+    departure_after = django_filters.IsoDateTimeFilter(
+        field_name="departure_time", lookup_expr="gte"
+    )
+    departure_before = django_filters.IsoDateTimeFilter(
+        field_name="departure_time", lookup_expr="lt"
+    )
+    date = django_filters.DateFilter(method="filter_date")
+
+    class Meta:
+        model = Journey
+        fields = ["route", "train"]
+
+    def filter_date(self, queryset, name, value):
+        # A half-open range keeps the departure_time indexes usable,
+        # unlike the __date lookup which wraps the column in a cast.
+        start = timezone.make_aware(datetime.combine(value, time.min))
+        return queryset.filter(
+            departure_time__gte=start,
+            departure_time__lt=start + timedelta(days=1),
+        )
+
+
+class RouteDailyStatsFilter(django_filters.FilterSet):
+    source = django_filters.NumberFilter(field_name="route__source")
+    destination = django_filters.NumberFilter(field_name="route__destination")
+    date_from = django_filters.DateFilter(field_name="date", lookup_expr="gte")
+    date_to = django_filters.DateFilter(field_name="date", lookup_expr="lte")
+
+    class Meta:
+        model = RouteDailyStats
+        fields = ["route"]
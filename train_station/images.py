@@ -0,0 +1,183 @@
+"""Resized WebP variants of uploaded train images.
+
+After an upload commits, a thread pool renders every size in
+``TRAIN_IMAGE_VARIANTS`` next to the original (``<name>-<variant>.webp``)
+and records them in ``Train.image_variants``; Pillow releases the GIL
+while resizing and encoding, so the work neither blocks the request nor
+serializes the pool. Until the variants exist, clients get an empty
+``image_variants`` and fall back to the original. Replacing or clearing
+the image drops the variants of the previous one at once, and their files
+once the change commits.
+"""
+
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from train_station.cache import bump_version
+from train_station.models import Train
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+# (train id, image name) -> future of the job processing it.
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.TRAIN_IMAGE_WORKERS,
+                thread_name_prefix="train-images",
+            )
+        return _executor
+
+
+def variant_name(name, variant) -> str:
+    stem, _ = os.path.splitext(name)
+    return f"{stem}-{variant}.webp"
+
+
+def render_variant(image, size) -> bytes:
+    image = image.copy()
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    output = io.BytesIO()
+    image.save(output, "WEBP", quality=settings.TRAIN_IMAGE_QUALITY)
+    return output.getvalue()
+
+
+def generate_variants(train_id, name) -> dict:
+    """Render and store the variants of image ``name`` of a train.
+
+    Nothing is recorded if the train got another image in the meantime.
+    Returns ``{variant: storage name}``.
+    """
+    with default_storage.open(name) as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image.load()
+
+    variants = {}
+    for variant, size in settings.TRAIN_IMAGE_VARIANTS.items():
+        target = variant_name(name, variant)
+        if default_storage.exists(target):
+            default_storage.delete(target)
+        variants[variant] = default_storage.save(
+            target, ContentFile(render_variant(image, size))
+        )
+
+    previous = (
+        Train.objects.filter(pk=train_id)
+        .values_list("image_variants", flat=True)
+        .first()
+    )
+    if Train.objects.filter(pk=train_id, image=name).update(
+        image_variants=variants
+    ):
+        bump_version(Train)
+        stale = set((previous or {}).values()) - set(variants.values())
+    else:
+        stale = set(variants.values())
+    delete_files(stale)
+    return variants
+
+
+def delete_files(names) -> None:
+    for name in names:
+        default_storage.delete(name)
+
+
+def run_in_worker(train_id, name):
+    try:
+        return generate_variants(train_id, name)
+    except Exception:
+        logger.exception("Could not create variants of %s", name)
+        raise
+    finally:
+        close_old_connections()
+
+
+def submit(train_id, name):
+    key = (train_id, name)
+    executor = get_executor()
+    with _pending_lock:
+        future = _pending.get(key)
+        if future is None:
+            future = executor.submit(run_in_worker, train_id, name)
+            _pending[key] = future
+            future.add_done_callback(lambda _: _pending.pop(key, None))
+    return future
+
+
+def expected_variants(train) -> dict:
+    """``{variant: storage name}`` the train's current image should have."""
+    if not train.image:
+        return {}
+    return {
+        variant: variant_name(train.image.name, variant)
+        for variant in settings.TRAIN_IMAGE_VARIANTS
+    }
+
+
+def current_variants(train) -> dict:
+    """The recorded variants that belong to the train's current image."""
+    expected = expected_variants(train)
+    return {
+        variant: name
+        for variant, name in (train.image_variants or {}).items()
+        if expected.get(variant) == name
+    }
+
+
+def missing_variants(train) -> bool:
+    """Whether the train's image lacks some of the configured variants."""
+    expected = expected_variants(train)
+    return bool(expected) and train.image_variants != expected
+
+
+def drop_stale_variants(train) -> None:
+    """Forget the variants of a replaced or cleared image.
+
+    Their files are deleted once the current transaction commits.
+    """
+    variants = current_variants(train)
+    stale = set((train.image_variants or {}).values()) - set(variants.values())
+    if not stale:
+        return
+    train.image_variants = variants
+    Train.objects.filter(pk=train.pk).update(image_variants=variants)
+    transaction.on_commit(lambda: delete_files(stale))
+
+
+def schedule_variants(train) -> None:
+    """Generate the variants of the train's image once the current
+    transaction commits.
+    """
+    if train.image:
+        train_id, name = train.pk, train.image.name
+        transaction.on_commit(lambda: submit(train_id, name))
+
+
+def wait_for_variants(timeout=None) -> None:
+    """Block until every submitted image has been processed."""
+    wait(list(_pending.values()), timeout=timeout)
+
+
+def variant_urls(train) -> dict:
+    return {
+        variant: default_storage.url(name)
+        for variant, name in current_variants(train).items()
+    }
@@ -0,0 +1,167 @@
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from train_station.availability import publish_availability
+from train_station.cache import bump_version
+from train_station.models import Journey, Order, SeatHold, Ticket
+
+
+def record_tickets_sold(deltas: dict[int, int]) -> None:
+    """Apply ``{journey_id: delta}`` changes to ``Journey.tickets_sold``.
+
+    The counters are updated with ``F()`` expressions so concurrent
+    orders for the same journey never overwrite each other; the new
+    counter and ``updated_at`` also retire the cached seat maps. The
+    journey cache version is bumped once the transaction commits.
+    """
+    for journey_id, delta in deltas.items():
+        if delta:
+            Journey.objects.filter(pk=journey_id).update(
+                tickets_sold=F("tickets_sold") + delta,
+                updated_at=timezone.now(),
+            )
+
+    journey_ids = list(deltas)
+    transaction.on_commit(lambda: journeys_changed(journey_ids))
+
+
+def journeys_changed(journey_ids) -> None:
+    bump_version(Journey)
+    publish_availability(journey_ids)
+
+
+def actual_tickets_sold():
+    return Coalesce(
+        Subquery(
+            Ticket.objects.filter(journey=OuterRef("pk"))
+            .order_by()
+            .values("journey")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def find_tickets_sold_mismatches():
+    """Return ``(journey_id, stored, actual)`` for every drifted counter."""
+    return list(
+        Journey.objects.annotate(actual=actual_tickets_sold())
+        .exclude(tickets_sold=F("actual"))
+        .order_by("pk")
+        .values_list("pk", "tickets_sold", "actual")
+    )
+
+
+def rebuild_tickets_sold(journey_ids=None) -> int:
+    """Recount sold tickets from the ``Ticket`` table.
+
+    Rebuilds every journey when ``journey_ids`` is ``None``.
+    Returns the number of updated journeys.
+    """
+    with transaction.atomic():
+        journeys = Journey.objects.all()
+        if journey_ids is not None:
+            journeys = journeys.filter(pk__in=journey_ids)
+        updated = journeys.update(
+            tickets_sold=actual_tickets_sold(), updated_at=timezone.now()
+        )
+        transaction.on_commit(lambda: bump_version(Journey))
+        return updated
+
+
+def create_tickets(order, tickets_data) -> list[Ticket]:
+    """Insert already validated tickets of ``order`` with one query.
+
+    ``bulk_create`` skips ``Ticket.save``/``full_clean`` and the
+    ``post_save`` signal, so seat ranges and conflicts must be checked by
+    the caller; the sold-seat counters are updated here instead.
+    """
+    tickets = Ticket.objects.bulk_create(
+        [Ticket(order=order, **ticket_data) for ticket_data in tickets_data]
+    )
+    record_tickets_sold(Counter(ticket.journey_id for ticket in tickets))
+    return tickets
+
+
+def seats_filter(positions) -> Q:
+    """Match any of the given ``(journey_id, cargo, seat)`` positions."""
+    return reduce(
+        or_,
+        (
+            Q(journey_id=journey_id, cargo=cargo, seat=seat)
+            for journey_id, cargo, seat in positions
+        ),
+    )
+
+
+def sweep_expired_holds(journey_ids=None) -> int:
+    holds = SeatHold.objects.expired()
+    if journey_ids is not None:
+        holds = holds.filter(journey_id__in=journey_ids)
+    deleted, _ = holds.delete()
+    return deleted
+
+
+def hold_seats(user, tickets_data, minutes) -> list[SeatHold]:
+    """Hold already validated seats for ``user`` during ``minutes``.
+
+    Expired holds on the same journeys are swept first and the user's own
+    holds on the requested seats are renewed. Raises ``IntegrityError``
+    when another customer holds one of the seats.
+    """
+    positions = [
+        (ticket["journey"].pk, ticket["cargo"], ticket["seat"])
+        for ticket in tickets_data
+    ]
+    expires_at = timezone.now() + timezone.timedelta(minutes=minutes)
+    with transaction.atomic():
+        sweep_expired_holds({journey_id for journey_id, _, _ in positions})
+        SeatHold.objects.filter(seats_filter(positions), user=user).delete()
+        return SeatHold.objects.bulk_create(
+            [
+                SeatHold(
+                    user=user,
+                    journey_id=journey_id,
+                    cargo=cargo,
+                    seat=seat,
+                    expires_at=expires_at,
+                )
+                for journey_id, cargo, seat in positions
+            ]
+        )
+
+
+def confirm_holds(user, hold_ids=None):
+    """Turn the user's active holds into an order, ``None`` if there are none.
+
+    Raises ``IntegrityError`` when one of the held seats was sold anyway.
+    """
+    with transaction.atomic():
+        holds = SeatHold.objects.active().select_for_update().filter(user=user)
+        if hold_ids is not None:
+            holds = holds.filter(pk__in=hold_ids)
+        holds = list(holds)
+        if not holds:
+            return None
+
+        order = Order.objects.create(user=user)
+        create_tickets(
+            order,
+            [
+                {
+                    "journey_id": hold.journey_id,
+                    "cargo": hold.cargo,
+                    "seat": hold.seat,
+                }
+                for hold in holds
+            ],
+        )
+        SeatHold.objects.filter(pk__in=[hold.pk for hold in holds]).delete()
+        return order
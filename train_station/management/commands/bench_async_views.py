@@ -0,0 +1,100 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from train_station.models import Journey
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the sync and async journey endpoints "
+        "against the current database. Sync requests run on a pool of "
+        "worker threads, async requests on one event loop with the same "
+        "number of concurrent clients. Run with DEBUG off for realistic "
+        "numbers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            default=[1, 4, 16],
+            help="Concurrency levels to measure.",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+
+    def handle(self, *args, **options):
+        journey = Journey.objects.order_by("pk").first()
+        if journey is None:
+            raise CommandError("No journeys to request, load some data first.")
+
+        endpoints = {
+            "journey list": "journey-list",
+            "journey detail": "journey-detail",
+        }
+        # The test clients send requests to "testserver".
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+        ):
+            for label, name in endpoints.items():
+                self.compare(label, name, journey, options)
+
+    def compare(self, label, name, journey, options):
+        args = [journey.pk] if name.endswith("detail") else []
+        sync_url = reverse(f"train_station:{name}", args=args)
+        async_url = reverse(f"train_station:async-{name}", args=args)
+        for workers in options["workers"]:
+            sync_rate = self.measure_sync(
+                sync_url, workers, options["requests"]
+            )
+            async_rate = asyncio.run(
+                self.measure_async(async_url, workers, options["requests"])
+            )
+            self.stdout.write(
+                f"{label}, {workers} workers: "
+                f"sync {sync_rate:.0f} req/s, async {async_rate:.0f} req/s"
+            )
+
+    def measure_sync(self, url, workers, requests):
+        def run(count):
+            client = Client()
+            try:
+                for _ in range(count):
+                    self.check_response(url, client.get(url))
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(run, self.split(requests, workers)))
+        return requests / (time.perf_counter() - started)
+
+    async def measure_async(self, url, workers, requests):
+        async def run(count):
+            client = AsyncClient()
+            for _ in range(count):
+                self.check_response(url, await client.get(url))
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(run(count) for count in self.split(requests, workers))
+        )
+        return requests / (time.perf_counter() - started)
+
+    @staticmethod
+    def check_response(url, response):
+        if response.status_code != 200:
+            raise CommandError(f"{url} answered {response.status_code}.")
+
+    @staticmethod
+    def split(requests, workers):
+        share, extra = divmod(requests, workers)
+        return [share + (i < extra) for i in range(workers)]
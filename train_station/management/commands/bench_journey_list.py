@@ -0,0 +1,77 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from train_station.models import Journey
+from train_station.performance import Rollback
+from train_station.serializers import JourneyListSerializer, JourneyListRows
+from train_station.synthetic import seed_timetable
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rendering journey list pages with JourneyListSerializer "
+        "and with the values()-based JourneyListRows on synthetic data. "
+        "All data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-sizes", type=int, nargs="+", default=[20, 100, 500]
+        )
+        parser.add_argument("--crew", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        seed_timetable(
+            journeys=max(options["page_sizes"]),
+            crew_per_journey=options["crew"],
+        )
+        renderer = JSONRenderer()
+        for page_size in options["page_sizes"]:
+            journeys = Journey.objects.order_by("departure_time", "id")[
+                :page_size
+            ]
+
+            def render_serializer():
+                page = journeys.select_related(
+                    "route__source", "route__destination", "train"
+                ).prefetch_related("crew")
+                return renderer.render(
+                    JourneyListSerializer(page, many=True).data
+                )
+
+            def render_rows():
+                page = journeys.values(*JourneyListRows.fields)
+                return renderer.render(JourneyListRows(page).data)
+
+            if render_serializer() != render_rows():
+                raise CommandError("The two paths render different JSON.")
+
+            serializer_ms = self.time(render_serializer, options["repeat"])
+            rows_ms = self.time(render_rows, options["repeat"])
+            self.stdout.write(
+                f"{page_size} journeys: serializer {serializer_ms:.2f} ms, "
+                f"rows {rows_ms:.2f} ms "
+                f"({serializer_ms / rows_ms:.1f}x faster)"
+            )
+
+    @staticmethod
+    def time(render, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,90 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from train_station.filters import JourneyFilter
+from train_station.models import Journey, Route
+from train_station.performance import Rollback
+from train_station.synthetic import seed_timetable
+
+INDEX_MARKERS = (
+    "Index Scan",
+    "Index Only Scan",
+    "USING INDEX",
+    "USING COVERING INDEX",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the journey search filters on synthetic data and print "
+        "their query plans. All data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--journeys", type=int, default=20000)
+        parser.add_argument("--stations", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        seed_timetable(
+            stations=options["stations"], journeys=options["journeys"]
+        )
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        route = Route.objects.order_by("pk").first()
+        first = Journey.objects.order_by("departure_time").first()
+        window = {
+            "departure_after": first.departure_time.isoformat(),
+            "departure_before": (
+                first.departure_time.replace(hour=23, minute=59)
+            ).isoformat(),
+        }
+        cases = {
+            "route + window": {"route": route.pk, **window},
+            "source/destination + window": {
+                "source": route.source_id,
+                "destination": route.destination_id,
+                **window,
+            },
+            "date": {"date": first.departure_time.date().isoformat()},
+        }
+        for name, params in cases.items():
+            queryset = JourneyFilter(
+                params,
+                queryset=Journey.objects.order_by("departure_time", "id"),
+            ).qs[:5]
+            self.report(name, queryset, options["repeat"])
+        self.report(
+            "order by arrival_time",
+            Journey.objects.order_by("arrival_time")[:5],
+            options["repeat"],
+        )
+
+    def report(self, name, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+
+        plan = queryset.explain()
+        uses_index = any(marker in plan for marker in INDEX_MARKERS)
+        self.stdout.write(
+            f"{name}: median {statistics.median(timings):.2f} ms, "
+            f"index scan: {'yes' if uses_index else 'NO'}"
+        )
+        self.stdout.write(plan)
+        self.stdout.write("")
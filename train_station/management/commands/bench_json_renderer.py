@@ -0,0 +1,81 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from train_station.fast_json import FastJSONRenderer, orjson
+from train_station.models import Journey, Order
+from train_station.performance import Rollback
+from train_station.serializers import JourneyListRows, OrderDetailSerializer
+from train_station.synthetic import seed_timetable
+
+
+class Command(BaseCommand):
+    help = (
+        "Time DRF's JSONRenderer against FastJSONRenderer on journey list "
+        "and order detail payloads built from synthetic data. All data is "
+        "rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=500)
+        parser.add_argument("--tickets-per-journey", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed.")
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        seed_timetable(
+            journeys=options["page_size"],
+            tickets_per_journey=options["tickets_per_journey"],
+        )
+        journeys = Journey.objects.order_by("departure_time", "id").values(
+            *JourneyListRows.fields
+        )[: options["page_size"]]
+        order = Order.objects.prefetch_related(
+            "tickets__journey__route__source",
+            "tickets__journey__route__destination",
+            "tickets__journey__train",
+            "tickets__journey__crew",
+        ).first()
+        payloads = {
+            f"journey list ({options['page_size']} journeys)": (
+                JourneyListRows(journeys).data
+            ),
+            f"order detail ({order.tickets.count()} tickets)": (
+                OrderDetailSerializer(order).data
+            ),
+        }
+
+        for name, data in payloads.items():
+            drf = JSONRenderer().render(data)
+            fast = FastJSONRenderer().render(data)
+            if drf != fast:
+                raise CommandError(f"{name}: the renderers disagree.")
+            drf_ms = self.time(JSONRenderer().render, data, options["repeat"])
+            fast_ms = self.time(
+                FastJSONRenderer().render, data, options["repeat"]
+            )
+            self.stdout.write(
+                f"{name}, {len(drf)} bytes: json {drf_ms:.3f} ms, "
+                f"orjson {fast_ms:.3f} ms ({drf_ms / fast_ms:.1f}x faster)"
+            )
+
+    @staticmethod
+    def time(render, data, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render(data)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from train_station.images import missing_variants, submit, wait_for_variants
+from train_station.models import Train
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the resized WebP variants of train images that lack them, "
+        "e.g. for images uploaded before the variants were configured."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recreate the variants of every image.",
+        )
+
+    def handle(self, *args, **options):
+        trains = Train.objects.exclude(image="").exclude(image__isnull=True)
+        futures = [
+            submit(train.pk, train.image.name)
+            for train in trains.iterator()
+            if options["all"] or missing_variants(train)
+        ]
+        wait_for_variants()
+
+        failed = sum(1 for future in futures if future.exception())
+        self.stdout.write(f"Processed {len(futures) - failed} image(s).")
+        if failed:
+            raise CommandError(f"{failed} image(s) could not be processed.")
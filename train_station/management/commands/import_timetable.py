@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from train_station.timetable_import import (
+    CHUNK_SIZE,
+    IMPORTERS,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream stations, trains, routes and journeys from CSV or JSON "
+        "Lines files into the database in bulk. Files are imported in "
+        "that order, so later ones may refer to rows of earlier ones. Rows "
+        "that already exist are skipped, invalid rows are reported."
+    )
+
+    def add_arguments(self, parser):
+        for kind in IMPORTERS:
+            parser.add_argument(
+                f"--{kind}", metavar="PATH", help="A .csv or .jsonl file."
+            )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        paths = {kind: options[kind] for kind in IMPORTERS if options[kind]}
+        if not paths:
+            raise CommandError(
+                "Pass at least one of "
+                + ", ".join(f"--{kind}" for kind in IMPORTERS)
+                + "."
+            )
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        rejected = 0
+        for kind, path in paths.items():
+            try:
+                result = IMPORTERS[kind]().run(
+                    read_rows(path), options["chunk_size"]
+                )
+            except (OSError, ValueError) as error:
+                raise CommandError(f"{path}: {error}")
+
+            for line_number, message in result.errors:
+                self.stderr.write(f"{path}:{line_number}: {message}")
+            rejected += len(result.errors)
+            self.stdout.write(
+                f"{result.kind}: {result.created} created, "
+                f"{result.skipped} skipped, {len(result.errors)} rejected "
+                f"in {result.seconds:.2f} s "
+                f"({result.rows_per_second:.0f} rows/s)"
+            )
+
+        if rejected:
+            raise CommandError(f"{rejected} row(s) rejected.")
@@ -0,0 +1,127 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from train_station.performance import (
+    ENDPOINTS,
+    Rollback,
+    build_context,
+    measure,
+)
+from train_station.synthetic import seed_timetable
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic data, measure query counts and p50/p95 latency of "
+        "the main endpoints and write them to a JSON report. Fails when a "
+        "query budget is exceeded or p95 regressed against --baseline. "
+        "All data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stations", type=int, default=50)
+        parser.add_argument("--journeys", type=int, default=5000)
+        parser.add_argument(
+            "--tickets-per-journey",
+            type=int,
+            default=20,
+            help="5000 journeys with 200 tickets each seed a million.",
+        )
+        parser.add_argument("--repeat", type=int, default=30)
+        parser.add_argument("--output", default="perf-report.json")
+        parser.add_argument(
+            "--baseline", help="An earlier report to compare p95 with."
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=1.25,
+            help="Allowed p95 ratio against the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 2:
+            raise CommandError("--repeat must be at least 2.")
+        if options["tickets_per_journey"] < 1:
+            raise CommandError("--tickets-per-journey must be at least 1.")
+
+        try:
+            with transaction.atomic():
+                report = self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+        with open(options["output"], "w") as file:
+            json.dump(report, file, indent=2)
+        self.stdout.write(f"Report written to {options['output']}.")
+
+        failures = self.check_budgets(report) + self.check_baseline(
+            report, options
+        )
+        if failures:
+            raise CommandError("\n".join(failures))
+
+    def run(self, options):
+        seeded = seed_timetable(
+            stations=options["stations"],
+            journeys=options["journeys"],
+            tickets_per_journey=options["tickets_per_journey"],
+        )
+        client = APIClient()
+        client.force_authenticate(seeded["user"])
+        context = build_context(seeded["user"])
+
+        endpoints = {}
+        # The test client talks to "testserver"; DEBUG would add the
+        # debug toolbar and query logging to every request.
+        with override_settings(
+            DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+        ):
+            for endpoint in ENDPOINTS:
+                endpoints[endpoint.name] = measure(
+                    client, endpoint, context, options["repeat"]
+                )
+                self.stdout.write(
+                    f"{endpoint.name}: {endpoints[endpoint.name]}"
+                )
+
+        return {
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "dataset": {
+                key: value for key, value in seeded.items() if key != "user"
+            },
+            "repeat": options["repeat"],
+            "endpoints": endpoints,
+        }
+
+    @staticmethod
+    def check_budgets(report):
+        return [
+            f"{name}: {result['queries']} queries, "
+            f"budget {result['max_queries']}"
+            for name, result in report["endpoints"].items()
+            if result["queries"] > result["max_queries"]
+        ]
+
+    @staticmethod
+    def check_baseline(report, options):
+        if not options["baseline"]:
+            return []
+        with open(options["baseline"]) as file:
+            baseline = json.load(file)["endpoints"]
+        return [
+            f"{name}: p95 {result['p95_ms']} ms, baseline "
+            f"{baseline[name]['p95_ms']} ms"
+            for name, result in report["endpoints"].items()
+            if name in baseline
+            and result["p95_ms"]
+            > baseline[name]["p95_ms"] * options["tolerance"]
+        ]
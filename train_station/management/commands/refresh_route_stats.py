@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from train_station.analytics import (
+    rebuild_route_daily_stats,
+    refresh_route_daily_stats,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the daily per-route occupancy aggregates from journeys "
+        "changed since the last run. Meant to run periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute every route day, e.g. after deleting journeys.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            rows = rebuild_route_daily_stats()
+        else:
+            rows = refresh_route_daily_stats()
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {rows} route day aggregate(s).")
+        )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from train_station.inventory import (
+    find_tickets_sold_mismatches,
+    rebuild_tickets_sold,
+)
+
+
+class Command(BaseCommand):
+    help = "Verify and rebuild the denormalized Journey.tickets_sold counter."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drifted counters, exit with an error if any.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recount every journey instead of only the drifted ones.",
+        )
+
+    def handle(self, *args, **options):
+        mismatches = find_tickets_sold_mismatches()
+        for journey_id, stored, actual in mismatches:
+            self.stdout.write(
+                f"Journey {journey_id}: stored {stored}, actual {actual}"
+            )
+
+        if options["check"]:
+            if mismatches:
+                raise CommandError(
+                    f"{len(mismatches)} journey counter(s) out of sync."
+                )
+            self.stdout.write(self.style.SUCCESS("All counters in sync."))
+            return
+
+        if options["all"]:
+            updated = rebuild_tickets_sold()
+        else:
+            updated = rebuild_tickets_sold(
+                [journey_id for journey_id, _, _ in mismatches]
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {updated} journey counter(s).")
+        )
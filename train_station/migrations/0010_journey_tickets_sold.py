@@ -0,0 +1,40 @@
+# Generated by Django 5.1 on 2026-10-18 06:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_tickets_sold(apps, schema_editor):
+    Journey = apps.get_model("train_station", "Journey")
+    Ticket = apps.get_model("train_station", "Ticket")
+    Journey.objects.update(
+        tickets_sold=Coalesce(
+            Subquery(
+                Ticket.objects.filter(journey=OuterRef("pk"))
+                .order_by()
+                .values("journey")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0009_train_image_alter_journey_departure_time"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_tickets_sold, migrations.RunPython.noop
+        ),
+    ]
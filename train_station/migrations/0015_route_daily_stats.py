@@ -0,0 +1,50 @@
+# Generated by Django 5.1 on 2026-10-18 06:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0014_journey_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RouteDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("journeys", models.PositiveIntegerField()),
+                ("seats", models.PositiveIntegerField()),
+                ("tickets_sold", models.PositiveIntegerField()),
+                ("journeys_updated_at", models.DateTimeField()),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="train_station.route",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "route daily stats",
+                "indexes": [
+                    models.Index(
+                        fields=["date"], name="route_daily_stats_date_idx"
+                    )
+                ],
+                "unique_together": {("route", "date")},
+            },
+        ),
+    ]
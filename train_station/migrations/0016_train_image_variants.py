@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 06:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0015_route_daily_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="train",
+            name="image_variants",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("train_station", "0016_train_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(fields=["updated_at"], name="journey_updated_at_idx"),
+        ),
+    ]
@@ -32,6 +32,8 @@ class Train(models.Model):
         TrainType, on_delete=models.CASCADE, related_name="trains"
     )
     image = models.ImageField(null=True, upload_to=train_image_file_path)
+    # {variant name: storage name}, filled in by train_station.images.
+    image_variants = models.JSONField(default=dict, editable=False)
 
     def __str__(self):
         return f"{self.name} (type: {self.train_type})"
@@ -90,6 +92,14 @@ class Order(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="order_user_created_idx",
+            )
+        ]
+
 
 class Ticket(models.Model):
     cargo = models.IntegerField()
@@ -104,18 +114,23 @@ class Ticket(models.Model):
     class Meta:
         unique_together = (("cargo", "journey", "seat"),)
 
-    def clean(self):
-        super().clean()
-        if not (1 <= self.seat <= self.journey.train.places_in_cargo):
-            raise ValidationError(
-                f"Seat must be between 1 and "
-                f"{self.journey.train.places_in_cargo}."
+    @staticmethod
+    def validate_ticket(cargo, seat, train, error_to_raise):
+        if not (1 <= seat <= train.places_in_cargo):
+            raise error_to_raise(
+                f"Seat must be between 1 and {train.places_in_cargo}."
             )
-        if not (1 <= self.cargo <= self.journey.train.cargo_num):
-            raise ValidationError(
-                f"Cargo must be between 1 and {self.journey.train.cargo_num}."
+        if not (1 <= cargo <= train.cargo_num):
+            raise error_to_raise(
+                f"Cargo must be between 1 and {train.cargo_num}."
             )
 
+    def clean(self):
+        super().clean()
+        Ticket.validate_ticket(
+            self.cargo, self.seat, self.journey.train, ValidationError
+        )
+
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
@@ -136,6 +151,29 @@ class Journey(models.Model):
     )
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, related_name="journeys")
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["route", "departure_time"],
+                name="journey_route_departure_idx",
+            ),
+            models.Index(
+                fields=["departure_time", "id"], name="journey_departure_idx"
+            ),
+            models.Index(fields=["arrival_time"], name="journey_arrival_idx"),
+            # Incremental refresh of the route analytics.
+            models.Index(fields=["updated_at"], name="journey_updated_at_idx"),
+        ]
+
+    @property
+    def tickets_available(self) -> int:
+        return (
+            self.train.cargo_num * self.train.places_in_cargo
+            - self.tickets_sold
+        )
 
     def clean(self):
         super().clean()
@@ -150,3 +188,64 @@ class Journey(models.Model):
 
     def __str__(self):
         return f"{self.route} ({self.departure_time} - {self.arrival_time})"
+
+
+class SeatHoldQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+
+class SeatHold(models.Model):
+    cargo = models.IntegerField()
+    seat = models.IntegerField()
+    journey = models.ForeignKey(
+        Journey, on_delete=models.CASCADE, related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds",
+    )
+    expires_at = models.DateTimeField()
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    class Meta:
+        unique_together = (("cargo", "journey", "seat"),)
+        indexes = [
+            models.Index(fields=["expires_at"], name="seathold_expires_at_idx")
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.journey} (train - {self.cargo}, seat - {self.seat}, "
+            f"until {self.expires_at})"
+        )
+
+
+class RouteDailyStats(models.Model):
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    date = models.DateField()
+    journeys = models.PositiveIntegerField()
+    seats = models.PositiveIntegerField()
+    tickets_sold = models.PositiveIntegerField()
+    journeys_updated_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = (("route", "date"),)
+        indexes = [
+            models.Index(fields=["date"], name="route_daily_stats_date_idx")
+        ]
+        verbose_name_plural = "route daily stats"
+
+    @property
+    def load_factor(self) -> float:
+        return round(self.tickets_sold / self.seats, 4) if self.seats else 0.0
+
+    def __str__(self):
+        return f"{self.route_id} on {self.date}"
@@ -0,0 +1,110 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class OptionalCountLimitOffsetPagination(LimitOffsetPagination):
+    """Limit/offset pagination that can skip the ``COUNT(*)`` query.
+
+    With ``?count=false`` one extra row is fetched to know whether there
+    is a next page and ``count`` is left out of the response.
+    """
+
+    count_query_param = "count"
+
+    def skip_count(self, request):
+        value = request.query_params.get(self.count_query_param, "")
+        return value.lower() in ("false", "0")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if not self.skip_count(request):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        rows = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[: self.limit]
+
+    def get_next_link(self):
+        if self.count is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        if self.count is not None:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
+class KeysetPagination(OptionalCountLimitOffsetPagination):
+    """Limit/offset pagination with an opt-in cursor (keyset) mode.
+
+    Requests carrying ``?cursor=`` or ``?pagination=cursor`` are paginated
+    by ``CursorPagination`` on ``ordering``, so every page is a range scan
+    starting after the previous one instead of skipping ``offset`` rows.
+    """
+
+    ordering = None
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+
+    def use_cursor(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == "cursor"
+        )
+
+    def get_cursor_paginator(self):
+        paginator = CursorPagination()
+        paginator.ordering = self.ordering
+        paginator.cursor_query_param = self.cursor_query_param
+        paginator.page_size = self.default_limit
+        paginator.page_size_query_param = self.limit_query_param
+        paginator.max_page_size = self.max_limit
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.get_cursor_paginator()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+
+
+class JourneyPagination(KeysetPagination):
+    ordering = ("departure_time", "id")
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("created_at", "id")
@@ -0,0 +1,165 @@
+"""Query budgets and latency measurements of the main API endpoints.
+
+The performance tests and the ``perf_report`` command share these
+definitions, so the budgets asserted in CI are the ones reported on
+production-sized data.
+"""
+
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from train_station.cache import get_response_cache
+from train_station.models import Journey, Order, Route
+
+
+class Rollback(Exception):
+    """Raised in ``transaction.atomic()`` by the benchmark commands to
+    discard the synthetic data they seeded."""
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: str
+    max_queries: int
+    path: Callable[[dict], str]
+    data: Optional[Callable[[dict, int], dict]] = None
+
+
+def order_payload(context, iteration) -> dict:
+    """Two free adjacent seats, different ones on every call."""
+    places = context["places_in_cargo"]
+    position = context["first_free_position"] + 2 * iteration
+    return {
+        "tickets": [
+            {
+                "journey": context["free_journey"],
+                "cargo": (position + offset) // places + 1,
+                "seat": (position + offset) % places + 1,
+            }
+            for offset in range(2)
+        ]
+    }
+
+
+ENDPOINTS = [
+    Endpoint(
+        "journeys list",
+        "get",
+        max_queries=3,
+        path=lambda context: reverse("train_station:journey-list"),
+    ),
+    Endpoint(
+        "journeys detail",
+        "get",
+        max_queries=4,
+        path=lambda context: reverse(
+            "train_station:journey-detail", args=[context["journey"]]
+        ),
+    ),
+    Endpoint(
+        "orders list",
+        "get",
+        max_queries=4,
+        path=lambda context: reverse("train_station:order-list"),
+    ),
+    Endpoint(
+        "orders detail",
+        "get",
+        max_queries=4,
+        path=lambda context: reverse(
+            "train_station:order-detail", args=[context["order"]]
+        ),
+    ),
+    Endpoint(
+        "orders create",
+        "post",
+        max_queries=9,
+        path=lambda context: reverse("train_station:order-list"),
+        data=order_payload,
+    ),
+    Endpoint(
+        "routes list",
+        "get",
+        max_queries=2,
+        path=lambda context: reverse("train_station:route-list"),
+    ),
+    Endpoint(
+        "routes detail",
+        "get",
+        max_queries=1,
+        path=lambda context: reverse(
+            "train_station:route-detail", args=[context["route"]]
+        ),
+    ),
+]
+
+
+def build_context(user) -> dict:
+    """Objects the endpoints are requested with, from seeded data."""
+    order = Order.objects.filter(user=user).order_by("pk").first()
+    journey = (
+        Journey.objects.filter(tickets__order=order).order_by("pk").first()
+        if order
+        else Journey.objects.order_by("pk").first()
+    )
+    free_journey = (
+        Journey.objects.select_related("train")
+        .order_by("tickets_sold", "pk")
+        .first()
+    )
+    return {
+        "journey": journey.pk,
+        "order": order.pk if order else None,
+        "route": Route.objects.order_by("pk").first().pk,
+        "free_journey": free_journey.pk,
+        "first_free_position": free_journey.tickets_sold,
+        "places_in_cargo": free_journey.train.places_in_cargo,
+    }
+
+
+def send(client, endpoint, context, iteration=0):
+    path = endpoint.path(context)
+    if endpoint.data is None:
+        response = getattr(client, endpoint.method)(path)
+    else:
+        response = getattr(client, endpoint.method)(
+            path, endpoint.data(context, iteration), format="json"
+        )
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f"{endpoint.name} answered {response.status_code}: "
+            f"{response.content[:200]!r}"
+        )
+    return response
+
+
+def count_queries(client, endpoint, context) -> int:
+    """Queries of one request with a cold response cache."""
+    get_response_cache().clear()
+    with CaptureQueriesContext(connection) as queries:
+        send(client, endpoint, context)
+    return len(queries)
+
+
+def measure(client, endpoint, context, repeat) -> dict:
+    """Query count and p50/p95 latency in milliseconds of an endpoint."""
+    queries = count_queries(client, endpoint, context)
+    timings = []
+    for iteration in range(1, repeat + 1):
+        started = time.perf_counter()
+        send(client, endpoint, context, iteration)
+        timings.append((time.perf_counter() - started) * 1000)
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "queries": queries,
+        "max_queries": endpoint.max_queries,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentiles[94], 3),
+    }
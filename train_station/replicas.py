@@ -0,0 +1,172 @@
+"""Routing of safe reads to read replicas.
+
+Viewsets with ``ReplicaReadMixin`` run their ``list`` and ``retrieve``
+actions against one of ``settings.REPLICA_DATABASES``; every other action
+and every write uses ``default``. After a successful write a user is
+pinned to the primary for ``REPLICA_STICKY_SECONDS`` so they read their
+own writes, and replicas lagging by more than that are skipped entirely.
+
+A replica may not have replayed a write whose cache invalidation already
+ran, so cached responses built from a replica only live for
+``REPLICA_STICKY_SECONDS`` (see ``cache_timeout``). Seat maps need no
+cap: they are keyed by the journey state they were read with.
+"""
+
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY = "default"
+
+current_read_database = ContextVar("current_read_database", default=None)
+
+_lag_checks = {}
+_lag_lock = threading.Lock()
+
+LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+class ReplicaRouter:
+    """Send reads to the database chosen for the current request."""
+
+    def db_for_read(self, model, **hints):
+        return current_read_database.get()
+
+    def db_for_write(self, model, **hints):
+        # Without an explicit answer Django would write an instance back
+        # to the database it was read from, i.e. possibly a replica.
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
+
+
+@contextmanager
+def use_database(alias):
+    token = current_read_database.set(alias)
+    try:
+        yield
+    finally:
+        current_read_database.reset(token)
+
+
+def measure_lag(alias) -> float:
+    """Seconds the replica is behind its primary, ``inf`` if unknown."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            (lag,) = cursor.fetchone()
+    except DatabaseError:
+        return math.inf
+    return math.inf if lag is None else float(lag)
+
+
+def replica_lag(alias) -> float:
+    """``measure_lag`` cached per process for REPLICA_LAG_CHECK_SECONDS."""
+    now = time.monotonic()
+    with _lag_lock:
+        checked = _lag_checks.get(alias)
+    if checked and now - checked[0] < settings.REPLICA_LAG_CHECK_SECONDS:
+        return checked[1]
+
+    lag = measure_lag(alias)
+    with _lag_lock:
+        _lag_checks[alias] = (now, lag)
+    return lag
+
+
+def fresh_replicas() -> list[str]:
+    return [
+        alias
+        for alias in settings.REPLICA_DATABASES
+        if replica_lag(alias) <= settings.REPLICA_STICKY_SECONDS
+    ]
+
+
+def cache_timeout(timeout):
+    """Timeout for a shared cache entry built by the current request.
+
+    Entries built from a replica are capped at the lag a used replica may
+    have, so one filled after an invalidation does not outlive the data
+    it is missing by more than that.
+    """
+    if current_read_database.get() in (None, PRIMARY):
+        return timeout
+    return min(timeout, settings.REPLICA_STICKY_SECONDS)
+
+
+def pin_key(user) -> str:
+    return f"replica-pin:{user.pk}"
+
+
+def pin_to_primary(user) -> None:
+    cache.set(pin_key(user), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned(user) -> bool:
+    return cache.get(pin_key(user), False)
+
+
+class ReplicaReadMixin:
+    replica_actions = ("list", "retrieve")
+    read_database = None
+
+    def dispatch(self, request, *args, **kwargs):
+        token = current_read_database.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            current_read_database.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.read_database = self.get_read_database(request)
+        current_read_database.set(self.read_database)
+
+    def get_read_database(self, request):
+        if not settings.REPLICA_DATABASES:
+            return None
+        if (
+            request.method not in SAFE_METHODS
+            or self.action not in self.replica_actions
+        ):
+            return None
+        if request.user.is_authenticated and is_pinned(request.user):
+            return None
+        replicas = fresh_replicas()
+        return random.choice(replicas) if replicas else None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            settings.REPLICA_DATABASES
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
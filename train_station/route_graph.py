@@ -0,0 +1,193 @@
+"""Shortest-distance queries over the ``Route`` graph.
+
+Routes are loaded into compressed adjacency arrays (CSR). Small networks
+memoize one Dijkstra tree per source station, which turns into an
+all-pairs table as queries come in; larger ones run A* guided by the
+great-circle distance between station coordinates.
+"""
+
+import heapq
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_right
+
+from django.conf import settings
+
+from train_station.models import Route, Station
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine(lat1, lon1, lat2, lon2) -> float:
+    """Great-circle distance in kilometres between radian coordinates."""
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class RouteGraph:
+    def __init__(self, stations, routes):
+        """``stations`` are ``(id, name, latitude, longitude)`` rows and
+        ``routes`` are ``(id, source_id, destination_id, distance)`` rows.
+        """
+        self.station_ids = []
+        self.names = []
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+        for station_id, name, latitude, longitude in stations:
+            self.station_ids.append(station_id)
+            self.names.append(name)
+            self.latitudes.append(math.radians(float(latitude)))
+            self.longitudes.append(math.radians(float(longitude)))
+        self.index = {
+            station_id: index
+            for index, station_id in enumerate(self.station_ids)
+        }
+
+        edges = sorted(
+            (self.index[source], self.index[destination], distance, pk)
+            for pk, source, destination, distance in routes
+            if source in self.index and destination in self.index
+        )
+        self.offsets = array("l", [0] * (len(self.station_ids) + 1))
+        self.targets = array("l")
+        self.weights = array("l")
+        self.route_ids = array("q")
+        for source, destination, distance, pk in edges:
+            self.offsets[source + 1] += 1
+            self.targets.append(destination)
+            self.weights.append(distance)
+            self.route_ids.append(pk)
+        for index in range(len(self.station_ids)):
+            self.offsets[index + 1] += self.offsets[index]
+
+        # Largest factor keeping the straight-line distance a lower bound
+        # of every edge, hence an admissible and consistent A* heuristic.
+        ratios = [
+            weight / crow_flies
+            for source, target, weight in self._edges()
+            if (crow_flies := self._crow_flies(source, target)) > 0
+        ]
+        self.heuristic_scale = max(0.0, min(ratios, default=0.0))
+        self.all_pairs = (
+            len(self.station_ids) <= settings.ROUTE_GRAPH_ALL_PAIRS_MAX
+        )
+        self._trees = {}
+
+    @classmethod
+    def build(cls) -> "RouteGraph":
+        return cls(
+            Station.objects.values_list("id", "name", "latitude", "longitude"),
+            Route.objects.values_list(
+                "id", "source_id", "destination_id", "distance"
+            ),
+        )
+
+    def _edges(self):
+        for source in range(len(self.station_ids)):
+            for edge in range(self.offsets[source], self.offsets[source + 1]):
+                yield source, self.targets[edge], self.weights[edge]
+
+    def _crow_flies(self, source, target) -> float:
+        return haversine(
+            self.latitudes[source],
+            self.longitudes[source],
+            self.latitudes[target],
+            self.longitudes[target],
+        )
+
+    def _search(self, source, target=None):
+        """Dijkstra from ``source``, or A* towards ``target`` when given.
+
+        Returns ``(distances, parent_edges)`` dictionaries.
+        """
+        distances = {source: 0}
+        parents = {}
+        done = set()
+        queue = [(0.0, source)]
+        while queue:
+            _, node = heapq.heappop(queue)
+            if node in done:
+                continue
+            done.add(node)
+            if node == target:
+                break
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                neighbour = self.targets[edge]
+                distance = distances[node] + self.weights[edge]
+                if distance < distances.get(neighbour, math.inf):
+                    distances[neighbour] = distance
+                    parents[neighbour] = edge
+                    estimate = distance
+                    if target is not None:
+                        estimate += self.heuristic_scale * self._crow_flies(
+                            neighbour, target
+                        )
+                    heapq.heappush(queue, (estimate, neighbour))
+        return distances, parents
+
+    def shortest_path(self, source_id, destination_id):
+        """Return ``{"distance", "stations", "routes"}`` or ``None``."""
+        if source_id not in self.index or destination_id not in self.index:
+            return None
+        source = self.index[source_id]
+        target = self.index[destination_id]
+
+        if self.all_pairs:
+            if source not in self._trees:
+                self._trees[source] = self._search(source)
+            distances, parents = self._trees[source]
+        else:
+            distances, parents = self._search(source, target)
+        if target not in distances:
+            return None
+
+        edges = []
+        node = target
+        while node != source:
+            edge = parents[node]
+            edges.append(edge)
+            node = self._edge_source(edge)
+        edges.reverse()
+
+        nodes = [source] + [self.targets[edge] for edge in edges]
+        return {
+            "distance": distances[target],
+            "stations": [
+                {"id": self.station_ids[node], "name": self.names[node]}
+                for node in nodes
+            ],
+            "routes": [self.route_ids[edge] for edge in edges],
+        }
+
+    def _edge_source(self, edge) -> int:
+        return bisect_right(self.offsets, edge) - 1
+
+
+_graph = None
+_built_at = 0.0
+_stale = True
+_lock = threading.Lock()
+
+
+def get_route_graph() -> RouteGraph:
+    """Return the process-wide route graph, rebuilding it when it was
+    invalidated or is older than ``ROUTE_GRAPH_TTL`` seconds.
+    """
+    global _graph, _built_at, _stale
+    with _lock:
+        expired = time.monotonic() - _built_at > settings.ROUTE_GRAPH_TTL
+        if _graph is None or _stale or expired:
+            _stale = False
+            _graph = RouteGraph.build()
+            _built_at = time.monotonic()
+        return _graph
+
+
+def invalidate_route_graph() -> None:
+    global _stale
+    _stale = True
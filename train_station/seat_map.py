@@ -0,0 +1,137 @@
+import base64
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+
+from train_station.models import Ticket
+
+SEAT_MAP_CACHE_KEY = "seat-map:{journey_id}:{tickets_sold}:{updated_at}"
+
+
+class SeatMap:
+    """Seat occupancy of a journey's train, one bit per cargo/seat.
+
+    Seat ``(cargo, seat)`` maps to bit ``(cargo - 1) * places_in_cargo
+    + (seat - 1)``; bits are packed most significant first, so the first
+    byte holds seats 1-8 of cargo 1.
+    """
+
+    def __init__(self, cargo_num: int, places_in_cargo: int, bits=None):
+        self.cargo_num = cargo_num
+        self.places_in_cargo = places_in_cargo
+        size = (cargo_num * places_in_cargo + 7) // 8
+        self.bits = bytearray(bits) if bits is not None else bytearray(size)
+
+    @classmethod
+    def from_tickets(cls, journey) -> "SeatMap":
+        seat_map = cls(journey.train.cargo_num, journey.train.places_in_cargo)
+        for cargo, seat in Ticket.objects.filter(journey=journey).values_list(
+            "cargo", "seat"
+        ):
+            seat_map.take(cargo, seat)
+        return seat_map
+
+    @property
+    def capacity(self) -> int:
+        return self.cargo_num * self.places_in_cargo
+
+    def _position(self, cargo: int, seat: int) -> tuple[int, int]:
+        index = (cargo - 1) * self.places_in_cargo + (seat - 1)
+        return index >> 3, 0x80 >> (index & 7)
+
+    def is_taken(self, cargo: int, seat: int) -> bool:
+        byte, mask = self._position(cargo, seat)
+        return bool(self.bits[byte] & mask)
+
+    def take(self, cargo: int, seat: int) -> None:
+        byte, mask = self._position(cargo, seat)
+        self.bits[byte] |= mask
+
+    def release(self, cargo: int, seat: int) -> None:
+        byte, mask = self._position(cargo, seat)
+        self.bits[byte] &= ~mask
+
+    def taken_count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def free_seats(self):
+        """Yield free ``(cargo, seat)`` pairs, skipping full bytes."""
+        for byte_index, byte in enumerate(self.bits):
+            if byte == 0xFF:
+                continue
+            for offset in range(8):
+                index = (byte_index << 3) + offset
+                if index >= self.capacity:
+                    return
+                if not byte & (0x80 >> offset):
+                    cargo, seat = divmod(index, self.places_in_cargo)
+                    yield cargo + 1, seat + 1
+
+    def find_block(self, count: int):
+        """Return ``count`` adjacent free seats of one cargo, or ``None``."""
+        block = []
+        for cargo, seat in self.free_seats():
+            if block and (cargo, seat - 1) != block[-1]:
+                block = []
+            block.append((cargo, seat))
+            if len(block) == count:
+                return block
+        return None
+
+    def allocate(self, count: int):
+        """Take ``count`` free seats, adjacent in one cargo when possible.
+
+        Returns the taken ``(cargo, seat)`` pairs, or ``None`` when the
+        train has fewer than ``count`` free seats.
+        """
+        seats = self.find_block(count)
+        if seats is None:
+            seats = list(islice(self.free_seats(), count))
+            if len(seats) < count:
+                return None
+        for cargo, seat in seats:
+            self.take(cargo, seat)
+        return seats
+
+    def to_representation(self) -> dict:
+        return {
+            "cargo_num": self.cargo_num,
+            "places_in_cargo": self.places_in_cargo,
+            "encoding": "bitmap",
+            "bitmap": base64.b64encode(bytes(self.bits)).decode("ascii"),
+        }
+
+
+def seat_map_cache_key(journey) -> str:
+    """Cache key of the journey's seat map in its current state.
+
+    Every ticket sale or refund bumps ``tickets_sold`` and ``updated_at``
+    of the journey, so a map built by a reader that saw the seats before
+    the sale committed is stored under a key nobody asks for afterwards;
+    a late ``cache.set`` can never hide a newer sale.
+    """
+    return SEAT_MAP_CACHE_KEY.format(
+        journey_id=journey.pk,
+        tickets_sold=journey.tickets_sold,
+        updated_at=journey.updated_at.timestamp(),
+    )
+
+
+def get_seat_map(journey) -> SeatMap:
+    """Return the journey's seat map, building and caching it on a miss.
+
+    ``journey`` must be freshly loaded: its state picks the cached map.
+    """
+    key = seat_map_cache_key(journey)
+    bits = cache.get(key)
+    if bits is not None:
+        seat_map = SeatMap(
+            journey.train.cargo_num, journey.train.places_in_cargo, bits
+        )
+        if len(seat_map.bits) == (seat_map.capacity + 7) // 8:
+            return seat_map
+
+    seat_map = SeatMap.from_tickets(journey)
+    cache.set(key, bytes(seat_map.bits), settings.SEAT_MAP_CACHE_TIMEOUT)
+    return seat_map
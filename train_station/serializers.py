@@ -1,4 +1,9 @@
-from django.db import transaction
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
 from rest_framework import serializers
 
 from train_station.models import (
@@ -10,7 +15,215 @@ from train_station.models import (
     Journey,
     Ticket,
     Order,
+    SeatHold,
+    RouteDailyStats,
 )
+from train_station.cache import bump_version
+from train_station.images import variant_urls
+from train_station.inventory import create_tickets, hold_seats, seats_filter
+from train_station.route_graph import invalidate_route_graph
+from train_station.seat_map import SeatMap, get_seat_map
+from train_station.timetable import invalidate_timetable
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that reads objects preloaded by its list serializer.
+
+    Falls back to the regular per-value lookup (and its error messages)
+    when the serializer is used on its own or the object is missing.
+    """
+
+    def to_internal_value(self, data):
+        field = self
+        if isinstance(self.parent, serializers.ManyRelatedField):
+            field = self.parent
+        preloaded = getattr(field.parent, "preloaded", {}).get(
+            field.field_name
+        )
+        if preloaded is not None and not isinstance(data, bool):
+            try:
+                return preloaded[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+
+class PreloadedListSerializer(serializers.ListSerializer):
+    """Resolves every PreloadedPrimaryKeyRelatedField of the child
+    with one ``in_bulk`` query per field for the whole list.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.child.preloaded = self.preload(data)
+        return super().to_internal_value(data)
+
+    def preload(self, data):
+        preloaded = {}
+        for name, field in self.child.fields.items():
+            many = isinstance(field, serializers.ManyRelatedField)
+            relation = field.child_relation if many else field
+            if field.read_only or not isinstance(
+                relation, PreloadedPrimaryKeyRelatedField
+            ):
+                continue
+
+            pks = set()
+            for item in data:
+                if not isinstance(item, dict):
+                    continue
+                values = item.get(name)
+                if not many or not isinstance(values, list):
+                    values = [values]
+                for value in values:
+                    if isinstance(value, (int, str)) and not isinstance(
+                        value, bool
+                    ):
+                        try:
+                            pks.add(int(value))
+                        except ValueError:
+                            pass
+            preloaded[name] = relation.get_queryset().in_bulk(pks)
+        return preloaded
+
+
+class BulkUpsertListSerializer(PreloadedListSerializer):
+    """Creates or updates a whole list of objects with a few queries.
+
+    Items are matched to existing objects by the child's
+    ``Meta.upsert_key`` fields: matches are updated with ``bulk_update``,
+    the rest inserted with ``bulk_create``, and many-to-many fields are
+    written straight to their through tables. ``bulk_*`` sends no model
+    signals, so ``saved()`` does what their receivers would have done.
+    """
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        self.validate_unique_keys(attrs)
+        return attrs
+
+    @property
+    def key_fields(self):
+        return self.child.Meta.upsert_key
+
+    def validate_unique_keys(self, attrs):
+        message = f"Another item has the same {', '.join(self.key_fields)}."
+        errors = []
+        seen = set()
+        for item in attrs:
+            key = self.upsert_key(item)
+            errors.append(
+                {"non_field_errors": [message]} if key in seen else {}
+            )
+            seen.add(key)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+    def upsert_key(self, item) -> tuple:
+        return tuple(
+            getattr(item[name], "pk", item[name]) for name in self.key_fields
+        )
+
+    def existing(self, validated_data) -> dict:
+        model = self.child.Meta.model
+        candidates = model.objects.filter(
+            **{
+                f"{name}__in": {item[name] for item in validated_data}
+                for name in self.key_fields
+            }
+        )
+        attnames = [
+            model._meta.get_field(name).attname for name in self.key_fields
+        ]
+        return {
+            tuple(getattr(instance, attname) for attname in attnames): instance
+            for instance in candidates
+        }
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        many_fields = [
+            name
+            for name, field in self.child.fields.items()
+            if isinstance(field, serializers.ManyRelatedField)
+            and not field.read_only
+        ]
+        auto_now = [
+            field
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+        existing = self.existing(validated_data) if validated_data else {}
+
+        instances, created, updated, update_fields = [], [], [], set()
+        related = {name: {} for name in many_fields}
+        for item in validated_data:
+            values = {
+                name: item.pop(name) for name in many_fields if name in item
+            }
+            instance = existing.get(self.upsert_key(item))
+            if instance is None:
+                instance = model(**item)
+                created.append(instance)
+            else:
+                for name, value in item.items():
+                    setattr(instance, name, value)
+                    update_fields.add(name)
+                for field in auto_now:
+                    field.pre_save(instance, add=False)
+                    update_fields.add(field.name)
+                updated.append(instance)
+            instances.append(instance)
+            for name, value in values.items():
+                related[name][id(instance)] = value
+
+        with transaction.atomic():
+            model.objects.bulk_create(created)
+            if updated:
+                model.objects.bulk_update(updated, sorted(update_fields))
+            for name in many_fields:
+                self.set_many(model, name, instances, related[name], updated)
+            transaction.on_commit(self.saved)
+        prefetch_related_objects(instances, *many_fields)
+        return instances
+
+    @staticmethod
+    def set_many(model, name, instances, values, updated):
+        """Write ``{id(instance): related objects}`` to the through table,
+        replacing the current rows of updated instances.
+        """
+        field = model._meta.get_field(name)
+        through = field.remote_field.through
+        source = f"{field.m2m_field_name()}_id"
+        target = f"{field.m2m_reverse_field_name()}_id"
+        replaced = [
+            instance.pk for instance in updated if id(instance) in values
+        ]
+        if replaced:
+            through.objects.filter(**{f"{source}__in": replaced}).delete()
+        through.objects.bulk_create(
+            [
+                through(**{source: instance.pk, target: related.pk})
+                for instance in instances
+                for related in values.get(id(instance), ())
+            ]
+        )
+
+    def saved(self) -> None:
+        bump_version(self.child.Meta.model)
+
+
+class RouteBulkListSerializer(BulkUpsertListSerializer):
+    def saved(self):
+        super().saved()
+        invalidate_timetable()
+        invalidate_route_graph()
+
+
+class JourneyBulkListSerializer(BulkUpsertListSerializer):
+    def saved(self):
+        super().saved()
+        invalidate_timetable()
 
 
 class TrainTypeSerializer(serializers.ModelSerializer):
@@ -20,6 +233,8 @@ class TrainTypeSerializer(serializers.ModelSerializer):
 
 
 class TrainSerializer(serializers.ModelSerializer):
+    image_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Train
         fields = (
@@ -29,9 +244,20 @@ class TrainSerializer(serializers.ModelSerializer):
             "places_in_cargo",
             "train_type",
             "image",
+            "image_variants",
         )
         read_only_fields = ("id", "image")
 
+    def get_image_variants(self, obj) -> dict:
+        request = self.context.get("request")
+        urls = variant_urls(obj)
+        if request is None:
+            return urls
+        return {
+            variant: request.build_absolute_uri(url)
+            for variant, url in urls.items()
+        }
+
 
 class TrainImageSerializer(serializers.ModelSerializer):
     class Meta:
@@ -64,6 +290,18 @@ class RouteSerializer(serializers.ModelSerializer):
         return route
 
 
+class RouteBulkSerializer(RouteSerializer):
+    source = PreloadedPrimaryKeyRelatedField(queryset=Station.objects.all())
+    destination = PreloadedPrimaryKeyRelatedField(
+        queryset=Station.objects.all()
+    )
+
+    class Meta(RouteSerializer.Meta):
+        list_serializer_class = RouteBulkListSerializer
+        upsert_key = ("source", "destination")
+        validators = []
+
+
 class RouteListSerializer(RouteSerializer):
     source = serializers.CharField(source="source.name")
     destination = serializers.CharField(source="destination.name")
@@ -74,6 +312,22 @@ class RouteDetailSerializer(RouteSerializer):
     destination = StationSerializer()
 
 
+class ShortestRouteQuerySerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+
+
+class RoutePathStationSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class RoutePathSerializer(serializers.Serializer):
+    distance = serializers.IntegerField()
+    stations = RoutePathStationSerializer(many=True)
+    routes = serializers.ListField(child=serializers.IntegerField())
+
+
 class CrewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Crew
@@ -101,6 +355,18 @@ class JourneySerializer(serializers.ModelSerializer):
         return data
 
 
+class JourneyBulkSerializer(JourneySerializer):
+    route = PreloadedPrimaryKeyRelatedField(queryset=Route.objects.all())
+    train = PreloadedPrimaryKeyRelatedField(queryset=Train.objects.all())
+    crew = PreloadedPrimaryKeyRelatedField(
+        queryset=Crew.objects.all(), many=True, allow_empty=False
+    )
+
+    class Meta(JourneySerializer.Meta):
+        list_serializer_class = JourneyBulkListSerializer
+        upsert_key = ("route", "train", "departure_time")
+
+
 class TicketTakenSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
@@ -136,6 +402,73 @@ class JourneyListSerializer(JourneySerializer):
         return obj.tickets_available
 
 
+class JourneyListRows:
+    """Read-only, ``values()``-based twin of ``JourneyListSerializer``.
+
+    Renders the same JSON from flat rows of ``values(*JourneyListRows
+    .fields)`` plus one query for the crew names, without building model
+    instances or running the per-field serializer machinery.
+    """
+
+    fields = (
+        "id",
+        "departure_time",
+        "arrival_time",
+        "tickets_sold",
+        "route__source__name",
+        "route__destination__name",
+        "train__name",
+        "train__cargo_num",
+        "train__places_in_cargo",
+    )
+    datetime_field = serializers.DateTimeField()
+
+    def __init__(self, instance=None, many=True, context=None):
+        self.instance = instance
+
+    @staticmethod
+    def crew_queryset(journey_ids):
+        # The same join the "crew" prefetch runs, so names come in its order.
+        return Crew.objects.filter(journeys__in=journey_ids).values_list(
+            "journeys", "first_name", "last_name"
+        )
+
+    def journey_ids(self):
+        return [row["id"] for row in self.instance]
+
+    @property
+    def data(self) -> list[dict]:
+        return self.to_representation(self.crew_queryset(self.journey_ids()))
+
+    async def adata(self) -> list[dict]:
+        return self.to_representation(
+            [crew async for crew in self.crew_queryset(self.journey_ids())]
+        )
+
+    def to_representation(self, crew) -> list[dict]:
+        crew_names = {}
+        for journey_id, first_name, last_name in crew:
+            crew_names.setdefault(journey_id, []).append(
+                f"{first_name} {last_name}"
+            )
+        to_datetime = self.datetime_field.to_representation
+        return [
+            {
+                "id": row["id"],
+                "route": f"{row['route__source__name']} - "
+                f"{row['route__destination__name']}",
+                "departure_time": to_datetime(row["departure_time"]),
+                "arrival_time": to_datetime(row["arrival_time"]),
+                "crew": crew_names.get(row["id"], []),
+                "train": row["train__name"],
+                "tickets_available": row["train__cargo_num"]
+                * row["train__places_in_cargo"]
+                - row["tickets_sold"],
+            }
+            for row in self.instance
+        ]
+
+
 class JourneyDetailSerializer(JourneySerializer):
     crew = CrewSerializer(many=True)
     train = TrainSerializer(many=False)
@@ -159,6 +492,66 @@ class JourneyDetailSerializer(JourneySerializer):
         )
 
 
+class JourneySeatMapSerializer(JourneyDetailSerializer):
+    taken_places = None
+    seat_map = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Journey
+        fields = (
+            "id",
+            "route",
+            "departure_time",
+            "arrival_time",
+            "crew",
+            "train",
+            "tickets_available",
+            "seat_map",
+        )
+
+    def get_seat_map(self, obj) -> dict:
+        return get_seat_map(obj).to_representation()
+
+
+class JourneySearchSerializer(serializers.Serializer):
+    origin = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    departure_after = serializers.DateTimeField(required=False)
+    departure_before = serializers.DateTimeField(required=False)
+    max_transfers = serializers.IntegerField(
+        min_value=0, max_value=2, default=2
+    )
+    min_transfer = serializers.IntegerField(
+        min_value=0, default=settings.TIMETABLE_MIN_TRANSFER_MINUTES
+    )
+
+    def validate(self, data):
+        data.setdefault("departure_after", timezone.now())
+        data.setdefault(
+            "departure_before", data["departure_after"] + timedelta(days=1)
+        )
+        if data["departure_before"] < data["departure_after"]:
+            raise serializers.ValidationError(
+                "departure_before must not be earlier than departure_after."
+            )
+        return data
+
+
+class ItineraryLegSerializer(serializers.Serializer):
+    journey = serializers.IntegerField()
+    source = serializers.CharField()
+    destination = serializers.CharField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    transfers = serializers.IntegerField()
+    legs = ItineraryLegSerializer(many=True)
+
+
 class TicketSummarySerializer(serializers.ModelSerializer):
     route = serializers.SerializerMethodField()
     train = serializers.SerializerMethodField()
@@ -174,24 +567,68 @@ class TicketSummarySerializer(serializers.ModelSerializer):
         return obj.journey.train.name
 
 
+class TicketListSerializer(PreloadedListSerializer):
+    unique_message = "The fields cargo, journey, seat must make a unique set."
+    held_message = "This seat is held by another customer."
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        self.validate_unique_seats(attrs)
+        return attrs
+
+    def validate_unique_seats(self, attrs):
+        positions = [
+            (ticket["journey"].pk, ticket["cargo"], ticket["seat"])
+            for ticket in attrs
+        ]
+        taken = set()
+        held = set()
+        if positions:
+            taken = set(
+                Ticket.objects.filter(seats_filter(positions)).values_list(
+                    "journey_id", "cargo", "seat"
+                )
+            )
+            holds = SeatHold.objects.active().filter(seats_filter(positions))
+            request = self.context.get("request")
+            if request is not None and request.user.is_authenticated:
+                holds = holds.exclude(user=request.user)
+            held = set(holds.values_list("journey_id", "cargo", "seat"))
+
+        errors = []
+        seen = set()
+        for position in positions:
+            if position in taken or position in seen:
+                errors.append({"non_field_errors": [self.unique_message]})
+            elif position in held:
+                errors.append({"non_field_errors": [self.held_message]})
+            else:
+                errors.append({})
+            seen.add(position)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    journey = PreloadedPrimaryKeyRelatedField(
+        queryset=Journey.objects.select_related("train")
+    )
 
     class Meta:
         model = Ticket
         fields = ("id", "cargo", "seat", "journey")
+        list_serializer_class = TicketListSerializer
+        validators = []
 
     def validate(self, data):
         journey = data.get("journey")
         if journey:
-            if not (1 <= data.get("seat") <= journey.train.places_in_cargo):
-                raise serializers.ValidationError(
-                    f"Seat must be between 1 and "
-                    f"{journey.train.places_in_cargo}."
-                )
-            if not (1 <= data.get("cargo") <= journey.train.cargo_num):
-                raise serializers.ValidationError(
-                    f"Cargo must be between 1 and {journey.train.cargo_num}."
-                )
+            Ticket.validate_ticket(
+                data.get("cargo"),
+                data.get("seat"),
+                journey.train,
+                serializers.ValidationError,
+            )
         return data
 
 
@@ -215,6 +652,11 @@ class OrderDetailSerializer(serializers.ModelSerializer):
         fields = ("id", "created_at", "tickets")
 
 
+class OrderExportQuerySerializer(serializers.Serializer):
+    created_after = serializers.DateField(required=False)
+    created_before = serializers.DateField(required=False)
+
+
 class OrderCreateSerializer(serializers.ModelSerializer):
     tickets = TicketSerializer(many=True)
 
@@ -223,10 +665,128 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         fields = ("id", "created_at", "tickets")
 
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+        try:
+            with transaction.atomic():
+                tickets_data = validated_data.pop("tickets")
+                order = Order.objects.create(**validated_data)
+                create_tickets(order, tickets_data)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"tickets": [TicketListSerializer.unique_message]}
+            )
 
-            return order
+        return order
+
+
+class OrderAllocateSerializer(serializers.ModelSerializer):
+    journey = serializers.PrimaryKeyRelatedField(
+        queryset=Journey.objects.select_related("train"), write_only=True
+    )
+    seats = serializers.IntegerField(min_value=1, write_only=True)
+    tickets = TicketSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = ("id", "created_at", "journey", "seats", "tickets")
+
+    def validate(self, data):
+        if data["seats"] > data["journey"].tickets_available:
+            raise serializers.ValidationError(
+                "Not enough free seats on this journey."
+            )
+        return data
+
+    def create(self, validated_data):
+        count = validated_data.pop("seats")
+        journey = validated_data.pop("journey")
+        try:
+            with transaction.atomic():
+                # Lock the journey only: the joined train row is shared by
+                # every journey of that train.
+                journey = (
+                    Journey.objects.select_for_update(of=("self",))
+                    .select_related("train")
+                    .get(pk=journey.pk)
+                )
+                seat_map = SeatMap.from_tickets(journey)
+                for cargo, seat in (
+                    SeatHold.objects.active()
+                    .filter(journey=journey)
+                    .exclude(user=validated_data["user"])
+                    .values_list("cargo", "seat")
+                ):
+                    seat_map.take(cargo, seat)
+                seats = seat_map.allocate(count)
+                if seats is None:
+                    raise serializers.ValidationError(
+                        "Not enough free seats on this journey."
+                    )
+                order = Order.objects.create(**validated_data)
+                create_tickets(
+                    order,
+                    [
+                        {"journey": journey, "cargo": cargo, "seat": seat}
+                        for cargo, seat in seats
+                    ],
+                )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                "Seats were taken concurrently, please try again."
+            )
+
+        return order
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ("id", "cargo", "seat", "journey", "expires_at")
+
+
+class SeatHoldCreateSerializer(serializers.Serializer):
+    tickets = TicketSerializer(many=True, write_only=True)
+    minutes = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.SEAT_HOLD_MAX_MINUTES,
+        default=settings.SEAT_HOLD_MINUTES,
+        write_only=True,
+    )
+    holds = SeatHoldSerializer(many=True, read_only=True)
+
+    def create(self, validated_data):
+        try:
+            holds = hold_seats(
+                validated_data["user"],
+                validated_data["tickets"],
+                validated_data["minutes"],
+            )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"tickets": [TicketListSerializer.held_message]}
+            )
+        return {"holds": holds}
+
+
+class SeatHoldConfirmSerializer(serializers.Serializer):
+    holds = serializers.ListField(
+        child=serializers.IntegerField(), required=False
+    )
+
+
+class RouteDailyStatsSerializer(serializers.ModelSerializer):
+    source = serializers.CharField(source="route.source.name")
+    destination = serializers.CharField(source="route.destination.name")
+    load_factor = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RouteDailyStats
+        fields = (
+            "route",
+            "source",
+            "destination",
+            "date",
+            "journeys",
+            "seats",
+            "tickets_sold",
+            "load_factor",
+        )
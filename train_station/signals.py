@@ -0,0 +1,95 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from train_station.cache import bump_version
+from train_station.images import (
+    drop_stale_variants,
+    missing_variants,
+    schedule_variants,
+)
+from train_station.inventory import record_tickets_sold
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Crew,
+    Journey,
+    Ticket,
+)
+from train_station.route_graph import invalidate_route_graph
+from train_station.timetable import invalidate_timetable
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_created(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        record_tickets_sold({instance.journey_id: 1})
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    record_tickets_sold({instance.journey_id: -1})
+
+
+@receiver(post_save, sender=Train)
+def train_saved(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    drop_stale_variants(instance)
+    if missing_variants(instance):
+        schedule_variants(instance)
+
+
+@receiver(post_save, sender=Journey)
+@receiver(post_delete, sender=Journey)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+def timetable_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_timetable)
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+def route_graph_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_route_graph)
+
+
+@receiver(post_save, sender=TrainType)
+@receiver(post_delete, sender=TrainType)
+@receiver(post_save, sender=Train)
+@receiver(post_delete, sender=Train)
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Crew)
+@receiver(post_delete, sender=Crew)
+@receiver(post_save, sender=Journey)
+@receiver(post_delete, sender=Journey)
+def reference_data_changed(sender, **kwargs):
+    # Bumped before commit, the new version could be filled with the old
+    # rows by a concurrent reader and served until it expires.
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+@receiver(m2m_changed, sender=Journey.crew.through)
+def journey_crew_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        journey_ids = [instance.pk]
+    elif pk_set:
+        journey_ids = pk_set
+    else:
+        journey_ids = list(instance.journeys.values_list("pk", flat=True))
+    Journey.objects.filter(pk__in=journey_ids).update(
+        updated_at=timezone.now()
+    )
+    transaction.on_commit(lambda: bump_version(Journey))
@@ -0,0 +1,147 @@
+"""Synthetic timetable data for benchmarks and performance tests."""
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from train_station.inventory import rebuild_tickets_sold
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Crew,
+    Journey,
+    Order,
+    Ticket,
+)
+
+BATCH_SIZE = 5000
+
+
+def seed_timetable(
+    stations=20,
+    journeys=1000,
+    tickets_per_journey=0,
+    crew_per_journey=2,
+    cargo_num=10,
+    places_in_cargo=50,
+    seed=0,
+):
+    """Bulk insert a random but reproducible network and timetable.
+
+    Stations are linked in a ring in both directions plus a few random
+    chords, journeys depart over the next 30 days and each journey gets
+    ``tickets_per_journey`` sold seats spread over orders of one user.
+    Returns a dict with the created user and the object counts.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    train_type = TrainType.objects.create(name=f"Synthetic {seed}")
+    trains = Train.objects.bulk_create(
+        [
+            Train(
+                name=f"Synthetic train {i}",
+                cargo_num=cargo_num,
+                places_in_cargo=places_in_cargo,
+                train_type=train_type,
+            )
+            for i in range(5)
+        ]
+    )
+    station_objs = Station.objects.bulk_create(
+        [
+            Station(
+                name=f"Synthetic station {i}",
+                latitude=round(rng.uniform(44, 52), 2),
+                longitude=round(rng.uniform(22, 40), 2),
+            )
+            for i in range(stations)
+        ]
+    )
+
+    edges = set()
+    for i in range(stations):
+        edges.add((i, (i + 1) % stations))
+        edges.add(((i + 1) % stations, i))
+    for _ in range(stations):
+        source, destination = rng.sample(range(stations), 2)
+        edges.add((source, destination))
+    routes = Route.objects.bulk_create(
+        [
+            Route(
+                source=station_objs[source],
+                destination=station_objs[destination],
+                distance=rng.randint(50, 900),
+            )
+            for source, destination in sorted(edges)
+        ]
+    )
+    crew = Crew.objects.bulk_create(
+        [Crew(first_name=f"Crew{i}", last_name="Synthetic") for i in range(20)]
+    )
+
+    journey_objs = []
+    for _ in range(journeys):
+        route = rng.choice(routes)
+        departure = now + timedelta(minutes=rng.randint(60, 30 * 24 * 60))
+        journey_objs.append(
+            Journey(
+                route=route,
+                train=rng.choice(trains),
+                departure_time=departure,
+                arrival_time=departure
+                + timedelta(minutes=max(30, route.distance // 2)),
+            )
+        )
+    journey_objs = Journey.objects.bulk_create(
+        journey_objs, batch_size=BATCH_SIZE
+    )
+    Journey.crew.through.objects.bulk_create(
+        [
+            Journey.crew.through(journey_id=journey.pk, crew_id=member.pk)
+            for journey in journey_objs
+            for member in rng.sample(crew, crew_per_journey)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    user = get_user_model().objects.create_user(
+        email=f"synthetic-{seed}@example.com", password="synthetic"
+    )
+    tickets = 0
+    if tickets_per_journey:
+        orders = Order.objects.bulk_create(
+            [Order(user=user) for _ in range(max(1, journeys // 10))]
+        )
+        batch = []
+        for index, journey in enumerate(journey_objs):
+            order = orders[index % len(orders)]
+            for position in range(tickets_per_journey):
+                cargo, seat = divmod(position, places_in_cargo)
+                batch.append(
+                    Ticket(
+                        journey=journey,
+                        order=order,
+                        cargo=cargo + 1,
+                        seat=seat + 1,
+                    )
+                )
+            if len(batch) >= BATCH_SIZE:
+                Ticket.objects.bulk_create(batch)
+                tickets += len(batch)
+                batch = []
+        Ticket.objects.bulk_create(batch)
+        tickets += len(batch)
+        rebuild_tickets_sold([journey.pk for journey in journey_objs])
+
+    return {
+        "user": user,
+        "stations": len(station_objs),
+        "routes": len(routes),
+        "journeys": len(journey_objs),
+        "tickets": tickets,
+    }
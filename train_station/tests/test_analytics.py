@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from train_station.analytics import (
+    rebuild_route_daily_stats,
+    refresh_route_daily_stats,
+    start_of,
+)
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Journey,
+    Order,
+    Ticket,
+    RouteDailyStats,
+)
+from user.models import CustomUser
+
+
+@override_settings(ROUTE_STATS_REFRESH_OVERLAP=0)
+class RouteDailyStatsTest(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="analyst@example.com", password="password", is_staff=True
+        )
+        kyiv = Station.objects.create(
+            name="Kyiv", latitude=50.45, longitude=30.52
+        )
+        lviv = Station.objects.create(
+            name="Lviv", latitude=49.84, longitude=24.03
+        )
+        self.route = Route.objects.create(
+            source=kyiv, destination=lviv, distance=540
+        )
+        self.back = Route.objects.create(
+            source=lviv, destination=kyiv, distance=540
+        )
+        self.train = Train.objects.create(
+            name="Intercity",
+            cargo_num=2,
+            places_in_cargo=10,
+            train_type=TrainType.objects.create(name="Express"),
+        )
+        self.day = timezone.localdate() + timedelta(days=2)
+        self.order = Order.objects.create(user=self.user)
+        self.morning = self.add_journey(self.route, hours=8, tickets=5)
+        self.add_journey(self.route, hours=18, tickets=3)
+        self.add_journey(self.route, hours=32, tickets=1)
+        self.add_journey(self.back, hours=9, tickets=0)
+
+    def add_journey(self, route, hours, tickets):
+        departure = start_of(self.day) + timedelta(hours=hours)
+        journey = Journey.objects.create(
+            route=route,
+            train=self.train,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=6),
+        )
+        for seat in range(1, tickets + 1):
+            self.sell(journey, seat)
+        return journey
+
+    def sell(self, journey, seat):
+        Ticket.objects.create(
+            cargo=1, seat=seat, journey=journey, order=self.order
+        )
+
+    def stats(self, route, day):
+        return RouteDailyStats.objects.get(route=route, date=day)
+
+    def test_rebuild_aggregates_route_days(self):
+        self.assertEqual(rebuild_route_daily_stats(), 3)
+
+        stats = self.stats(self.route, self.day)
+        self.assertEqual(stats.journeys, 2)
+        self.assertEqual(stats.seats, 40)
+        self.assertEqual(stats.tickets_sold, 8)
+        self.assertEqual(stats.load_factor, 0.2)
+        self.assertEqual(
+            self.stats(self.route, self.day + timedelta(days=1)).tickets_sold,
+            1,
+        )
+        self.assertEqual(self.stats(self.back, self.day).tickets_sold, 0)
+
+    def test_refresh_recomputes_only_changed_route_days(self):
+        self.assertEqual(refresh_route_daily_stats(), 3)
+        self.assertEqual(refresh_route_daily_stats(), 0)
+
+        self.sell(self.morning, 6)
+        self.assertEqual(refresh_route_daily_stats(), 1)
+        self.assertEqual(self.stats(self.route, self.day).tickets_sold, 9)
+
+        self.add_journey(self.back, hours=40, tickets=2)
+        self.assertEqual(refresh_route_daily_stats(), 1)
+        self.assertEqual(RouteDailyStats.objects.count(), 4)
+
+    def test_api_filters_by_route_and_date(self):
+        rebuild_route_daily_stats()
+        url = reverse("train_station:routedailystats-list")
+        self.assertEqual(
+            self.client.get(url).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            url, {"route": self.route.id, "date_to": self.day.isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(
+            response.data["results"][0],
+            {
+                "route": self.route.id,
+                "source": "Kyiv",
+                "destination": "Lviv",
+                "date": self.day.isoformat(),
+                "journeys": 2,
+                "seats": 40,
+                "tickets_sold": 8,
+                "load_factor": 0.2,
+            },
+        )
+
+        response = self.client.get(
+            url, {"source": self.back.source_id, "date_from": self.day}
+        )
+        self.assertEqual(response.data["count"], 1)
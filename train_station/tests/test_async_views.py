@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from train_station.cache import get_response_cache
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Crew,
+    Journey,
+    Order,
+    Ticket,
+)
+from user.models import CustomUser
+
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.station1 = Station.objects.create(
+            name="Station A", latitude=50.45, longitude=30.52
+        )
+        self.station2 = Station.objects.create(
+            name="Station B", latitude=50.46, longitude=30.53
+        )
+        self.route = Route.objects.create(
+            source=self.station1, destination=self.station2, distance=100
+        )
+        train = Train.objects.create(
+            name="Train1",
+            cargo_num=5,
+            places_in_cargo=50,
+            train_type=TrainType.objects.create(name="Passenger"),
+        )
+        crew = Crew.objects.create(first_name="John", last_name="Doe")
+        for hours in range(1, 8):
+            journey = Journey.objects.create(
+                route=self.route,
+                train=train,
+                departure_time=timezone.now() + timedelta(hours=hours),
+                arrival_time=timezone.now() + timedelta(hours=hours + 1),
+            )
+            journey.crew.add(crew)
+        self.journey = journey
+        order = Order.objects.create(
+            user=CustomUser.objects.create_user(
+                email="testuser@example.com", password="testpassword"
+            )
+        )
+        Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journey, order=order
+        )
+
+    def assertSameResponse(self, name, args=(), params=None):
+        sync = self.client.get(
+            reverse(f"train_station:{name}", args=args), params
+        ).json()
+        response = self.client.get(
+            reverse(f"train_station:async-{name}", args=args), params
+        )
+        data = response.json()
+        for link in ("next", "previous"):
+            if data.get(link):
+                self.assertIn("/async/", data.pop(link))
+                sync.pop(link)
+        self.assertEqual(data, sync)
+        return response
+
+    def test_journey_list_matches_sync(self):
+        params = {"ordering": "-departure_time", "limit": 3, "offset": 2}
+        response = self.assertSameResponse("journey-list", params=params)
+        self.assertEqual(response.json()["count"], 7)
+        self.assertSameResponse(
+            "journey-list", params={"ordering": "departure_time", "count": 0}
+        )
+        self.assertSameResponse(
+            "journey-list", params={"route": self.route.id}
+        )
+
+    def test_journey_detail_matches_sync(self):
+        response = self.assertSameResponse(
+            "journey-detail", args=[self.journey.id]
+        )
+        self.assertEqual(
+            response.json()["taken_places"], [{"cargo": 1, "seat": 1}]
+        )
+
+    def test_station_and_route_match_sync(self):
+        self.assertSameResponse("station-list", params={"ordering": "-name"})
+        self.assertSameResponse("station-detail", args=[self.station2.id])
+        self.assertSameResponse("route-list")
+        self.assertSameResponse("route-detail", args=[self.route.id])
+
+    def test_missing_object(self):
+        response = self.client.get(
+            reverse("train_station:async-journey-detail", args=[0])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_filter(self):
+        response = self.client.get(
+            reverse("train_station:async-journey-list"),
+            {"departure_after": "soon"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("departure_after", response.json())
+
+    async def test_served_by_async_client(self):
+        response = await self.async_client.get(
+            reverse("train_station:async-route-list")
+        )
+        self.assertEqual(response.json()["results"][0]["source"], "Station A")
+
+    def test_writes_are_not_allowed(self):
+        response = self.client.post(
+            reverse("train_station:async-station-list")
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
+        )
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from train_station.availability import CHANNEL, broker, relay
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Journey,
+    Order,
+    Ticket,
+)
+from user.models import CustomUser
+
+
+class AvailabilityBrokerTest(SimpleTestCase):
+    async def test_publish_from_another_thread_is_coalesced(self):
+        subscription = broker.subscribe({1, 2})
+        try:
+            publisher = threading.Thread(
+                target=lambda: [
+                    broker.publish({1: 10, 3: 7}),
+                    broker.publish({1: 9, 2: 4}),
+                ]
+            )
+            publisher.start()
+            publisher.join()
+            await asyncio.sleep(0)
+            self.assertEqual(await subscription.get(1), {1: 9, 2: 4})
+            self.assertEqual(await subscription.get(0.01), {})
+        finally:
+            broker.unsubscribe(subscription)
+        self.assertEqual(broker.watched([1, 2]), [])
+
+
+class AvailabilityStreamTest(TestCase):
+    def setUp(self):
+        source = Station.objects.create(
+            name="Source", latitude=51.50, longitude=-0.12
+        )
+        destination = Station.objects.create(
+            name="Destination", latitude=48.85, longitude=2.35
+        )
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=source, destination=destination, distance=200
+            ),
+            train=Train.objects.create(
+                name="Train A",
+                cargo_num=2,
+                places_in_cargo=10,
+                train_type=TrainType.objects.create(name="Local"),
+            ),
+            departure_time=timezone.now() + timezone.timedelta(hours=1),
+            arrival_time=timezone.now() + timezone.timedelta(hours=3),
+        )
+        self.url = reverse("train_station:journey-availability-stream")
+
+    async def subscribe(self):
+        return broker.subscribe({self.journey.id})
+
+    def test_committed_ticket_is_published(self):
+        loop = asyncio.new_event_loop()
+        subscription = loop.run_until_complete(self.subscribe())
+        try:
+            order = Order.objects.create(
+                user=CustomUser.objects.create_user(
+                    email="testuser@example.com", password="password123"
+                )
+            )
+            with self.captureOnCommitCallbacks(execute=True):
+                Ticket.objects.create(
+                    cargo=1, seat=1, journey=self.journey, order=order
+                )
+            changes = loop.run_until_complete(subscription.get(1))
+        finally:
+            broker.unsubscribe(subscription)
+            loop.close()
+        self.assertEqual(changes, {self.journey.id: 19})
+
+    @override_settings(AVAILABILITY_REDIS_URL="redis://redis:6379/0")
+    def test_changes_are_announced_through_redis(self):
+        order = Order.objects.create(
+            user=CustomUser.objects.create_user(
+                email="testuser@example.com", password="password123"
+            )
+        )
+        with mock.patch.object(relay, "client") as client:
+            with self.captureOnCommitCallbacks(execute=True):
+                Ticket.objects.create(
+                    cargo=1, seat=1, journey=self.journey, order=order
+                )
+        client.return_value.publish.assert_called_once_with(
+            CHANNEL, json.dumps([self.journey.id])
+        )
+
+    def test_relayed_change_reaches_local_streams(self):
+        loop = asyncio.new_event_loop()
+        subscription = loop.run_until_complete(self.subscribe())
+        try:
+            relay.receive(
+                {"type": "message", "data": json.dumps([self.journey.id])}
+            )
+            changes = loop.run_until_complete(subscription.get(1))
+        finally:
+            broker.unsubscribe(subscription)
+            loop.close()
+        self.assertEqual(changes, {self.journey.id: 20})
+
+    async def test_stream_starts_with_snapshot(self):
+        response = await self.async_client.get(
+            self.url, {"journeys": str(self.journey.id)}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        first = await anext(aiter(response.streaming_content))
+        response.close()
+        self.assertEqual(
+            first.decode(),
+            "event: availability\n"
+            f'data: {{"journey": {self.journey.id}, '
+            '"tickets_available": 20}\n\n',
+        )
+        self.assertEqual(broker.watched([self.journey.id]), [])
+
+    def test_journeys_are_required(self):
+        response = self.client.get(self.url, {"journeys": "1,x"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,59 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from train_station.cache import get_response_cache, get_stats, get_versions
+from train_station.models import Station, Route
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.station1 = Station.objects.create(
+            name="Station A", latitude=50.45, longitude=30.52
+        )
+        self.station2 = Station.objects.create(
+            name="Station B", latitude=50.46, longitude=30.53
+        )
+        self.route = Route.objects.create(
+            source=self.station1, destination=self.station2, distance=100
+        )
+        self.url = reverse("train_station:route-list")
+
+    def test_second_request_is_served_from_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.data["results"][0]["source"], "Station A")
+        self.assertEqual(get_stats(), {"hits": 1, "misses": 1})
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, {"ordering": "distance"})
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_dependency_change_invalidates(self):
+        self.client.get(self.url)
+        self.station1.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.station1.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["source"], "Renamed")
+
+    def test_version_is_bumped_only_on_commit(self):
+        [version] = get_versions([Station])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.station1.save()
+            self.assertEqual(get_versions([Station]), [version])
+        self.assertNotEqual(get_versions([Station]), [version])
+
+    def test_retrieve_is_invalidated_by_delete(self):
+        url = reverse("train_station:station-detail", args=[self.station2.id])
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.station2.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Crew,
+    Journey,
+    Order,
+    Ticket,
+    SeatHold,
+)
+from user.models import CustomUser
+
+
+class JourneyCommandTestCase(TestCase):
+    def setUp(self):
+        source = Station.objects.create(
+            name="Source", latitude=51.50, longitude=-0.12
+        )
+        destination = Station.objects.create(
+            name="Destination", latitude=48.85, longitude=2.35
+        )
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=source, destination=destination, distance=200
+            ),
+            train=Train.objects.create(
+                name="Train A",
+                cargo_num=2,
+                places_in_cargo=10,
+                train_type=TrainType.objects.create(name="Local"),
+            ),
+            departure_time=timezone.now() + timezone.timedelta(hours=1),
+            arrival_time=timezone.now() + timezone.timedelta(hours=3),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="testuser@example.com", password="password123"
+        )
+
+
+class SyncTicketsSoldCommandTest(JourneyCommandTestCase):
+    def setUp(self):
+        super().setUp()
+        Ticket.objects.create(
+            cargo=1,
+            seat=1,
+            journey=self.journey,
+            order=Order.objects.create(user=self.user),
+        )
+        Journey.objects.filter(pk=self.journey.pk).update(tickets_sold=7)
+
+    def test_check_reports_drift(self):
+        with self.assertRaises(CommandError):
+            call_command("sync_tickets_sold", "--check", stdout=StringIO())
+
+    def test_rebuild_fixes_drift(self):
+        call_command("sync_tickets_sold", stdout=StringIO())
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 1)
+        call_command("sync_tickets_sold", "--check", stdout=StringIO())
+
+
+class SweepSeatHoldsCommandTest(JourneyCommandTestCase):
+    def test_sweep_deletes_only_expired_holds(self):
+        for seat, minutes in ((2, -1), (3, 10)):
+            SeatHold.objects.create(
+                journey=self.journey,
+                cargo=1,
+                seat=seat,
+                user=self.user,
+                expires_at=timezone.now()
+                + timezone.timedelta(minutes=minutes),
+            )
+        call_command("sweep_seat_holds", stdout=StringIO())
+        self.assertEqual(
+            list(SeatHold.objects.values_list("seat", flat=True)), [3]
+        )
+
+
+class ImportTimetableCommandTest(JourneyCommandTestCase):
+    def setUp(self):
+        super().setUp()
+        Crew.objects.create(first_name="Ann", last_name="Driver")
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def departure(self, hours):
+        return (timezone.now() + timezone.timedelta(hours=hours)).isoformat()
+
+    def test_imports_rows_referring_to_earlier_files(self):
+        stations = self.write(
+            "stations.csv",
+            "name,latitude,longitude\nMiddle,50.45,30.52\n",
+        )
+        routes = self.write(
+            "routes.csv",
+            "source,destination,distance\n"
+            "Source,Middle,100\nMiddle,Destination,120\n",
+        )
+        journeys = self.write(
+            "journeys.jsonl",
+            "\n".join(
+                json.dumps(
+                    {
+                        "source": "Source",
+                        "destination": "Middle",
+                        "train": "Train A",
+                        "departure_time": self.departure(hours),
+                        "arrival_time": self.departure(hours + 1),
+                        "crew": ["Ann Driver"],
+                    }
+                )
+                for hours in (2, 4)
+            ),
+        )
+        call_command(
+            "import_timetable",
+            "--stations",
+            stations,
+            "--routes",
+            routes,
+            "--journeys",
+            journeys,
+            "--chunk-size",
+            "1",
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(Route.objects.count(), 3)
+        imported = Journey.objects.filter(route__destination__name="Middle")
+        self.assertEqual(imported.count(), 2)
+        self.assertEqual(
+            set(imported.values_list("crew__last_name", flat=True)),
+            {"Driver"},
+        )
+
+    def test_existing_rows_are_skipped_and_invalid_rows_reported(self):
+        journeys = self.write(
+            "journeys.csv",
+            "source,destination,train,departure_time,arrival_time,crew\n"
+            f"Source,Destination,Train A,"
+            f"{self.journey.departure_time.isoformat()},"
+            f"{self.journey.arrival_time.isoformat()},\n"
+            f"Source,Destination,Train B,{self.departure(2)},"
+            f"{self.departure(3)},\n"
+            f"Source,Destination,Train A,{self.departure(3)},"
+            f"{self.departure(2)},Ann Driver\n",
+        )
+        stderr = StringIO()
+        with self.assertRaisesMessage(CommandError, "2 row(s) rejected."):
+            call_command(
+                "import_timetable",
+                "--journeys",
+                journeys,
+                stdout=StringIO(),
+                stderr=stderr,
+            )
+
+        self.assertEqual(Journey.objects.count(), 1)
+        self.assertIn(
+            "journeys.csv:3: Unknown train 'Train B'.", stderr.getvalue()
+        )
+        self.assertIn("journeys.csv:4:", stderr.getvalue())
@@ -0,0 +1,81 @@
+import io
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from train_station import fast_json
+from train_station.fast_json import FastJSONRenderer, FastJSONParser
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    data = ReturnDict(
+        {
+            "latitude": Decimal("50.450000"),
+            "departure_time": datetime(
+                2030, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc
+            ),
+            "local": datetime(
+                2030, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2))
+            ),
+            "date": date(2030, 1, 2),
+            "time": time(12, 30, 15, 500000),
+            "duration": timedelta(hours=1, seconds=30),
+            "crew": ["Jöhn Doe", "Line\u2028Separator"],
+            "detail": gettext_lazy("Not found."),
+            "taken": {1: [(1, 2)]},
+            "empty": None,
+        },
+        serializer=None,
+    )
+
+    def test_matches_drf_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data),
+            JSONRenderer().render(self.data),
+        )
+
+    def test_indented_output_uses_stdlib(self):
+        with mock.patch.object(fast_json.orjson, "dumps") as dumps:
+            rendered = FastJSONRenderer().render(
+                self.data, "application/json; indent=2"
+            )
+        dumps.assert_not_called()
+        self.assertEqual(
+            rendered,
+            JSONRenderer().render(self.data, "application/json; indent=2"),
+        )
+
+    def test_without_orjson(self):
+        with mock.patch.object(fast_json, "orjson", None):
+            rendered = FastJSONRenderer().render(self.data)
+        self.assertEqual(rendered, JSONRenderer().render(self.data))
+
+    def test_unsupported_type_raises_like_drf(self):
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({"value": object()})
+
+
+class FastJSONParserTest(SimpleTestCase):
+    def test_matches_drf_parser(self):
+        body = '{"tickets": [{"cargo": 1, "seat": 2.5}], "name": "Київ"}'
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body.encode())),
+            JSONParser().parse(io.BytesIO(body.encode())),
+        )
+
+    def test_errors_match_drf_parser(self):
+        for body in (b'{"seat": }', b'{"seat": NaN}'):
+            with self.assertRaises(ParseError) as expected:
+                JSONParser().parse(io.BytesIO(body))
+            with self.assertRaises(ParseError) as error:
+                FastJSONParser().parse(io.BytesIO(body))
+            self.assertEqual(
+                str(error.exception.detail), str(expected.exception.detail)
+            )
@@ -0,0 +1,180 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.images import (
+    generate_variants,
+    missing_variants,
+    variant_name,
+    variant_urls,
+    wait_for_variants,
+)
+from train_station.models import TrainType, Train
+from user.models import CustomUser
+
+
+def make_upload(name="train.jpg", size=(1200, 800), image_format="JPEG"):
+    output = io.BytesIO()
+    Image.new("RGB", size, "steelblue").save(output, image_format)
+    return SimpleUploadedFile(
+        name, output.getvalue(), content_type=f"image/{image_format.lower()}"
+    )
+
+
+class TemporaryMediaMixin:
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_train(self, **kwargs):
+        return Train.objects.create(
+            name="Intercity",
+            cargo_num=5,
+            places_in_cargo=40,
+            train_type=TrainType.objects.create(name="Express"),
+            **kwargs,
+        )
+
+
+class GenerateVariantsTest(TemporaryMediaMixin, TestCase):
+    def test_variants_are_resized_webp_files(self):
+        train = self.create_train(image=make_upload())
+        self.assertTrue(missing_variants(train))
+
+        variants = generate_variants(train.pk, train.image.name)
+
+        train.refresh_from_db()
+        self.assertEqual(train.image_variants, variants)
+        self.assertFalse(missing_variants(train))
+        with default_storage.open(variants["thumbnail"]) as file:
+            thumbnail = Image.open(file)
+            self.assertEqual(thumbnail.format, "WEBP")
+            self.assertEqual(thumbnail.size, (160, 107))
+
+    def test_new_image_replaces_old_variants(self):
+        train = self.create_train(image=make_upload())
+        old = generate_variants(train.pk, train.image.name)
+
+        train.refresh_from_db()
+        train.image = make_upload("new.png", image_format="PNG")
+        with mock.patch("train_station.images.submit"):
+            with self.captureOnCommitCallbacks(execute=True):
+                train.save()
+        train.refresh_from_db()
+        self.assertEqual(train.image_variants, {})
+        new = generate_variants(train.pk, train.image.name)
+
+        self.assertTrue(
+            all(default_storage.exists(name) for name in new.values())
+        )
+        self.assertFalse(
+            any(default_storage.exists(name) for name in old.values())
+        )
+
+    def test_urls_only_list_variants_of_current_image(self):
+        train = self.create_train(image=make_upload())
+        generate_variants(train.pk, train.image.name)
+        Train.objects.filter(pk=train.pk).update(image=None)
+
+        train.refresh_from_db()
+        self.assertNotEqual(train.image_variants, {})
+        self.assertEqual(variant_urls(train), {})
+
+    def test_outdated_job_keeps_current_variants(self):
+        train = self.create_train(image=make_upload())
+        old_name = train.image.name
+        train.image = make_upload("new.jpg")
+        train.save()
+
+        variants = generate_variants(train.pk, old_name)
+
+        train.refresh_from_db()
+        self.assertEqual(train.image_variants, {})
+        self.assertFalse(
+            any(default_storage.exists(name) for name in variants.values())
+        )
+
+
+class UploadImageTest(TemporaryMediaMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.train = self.create_train()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            CustomUser.objects.create_user(
+                email="user@example.com", password="password"
+            )
+        )
+
+    def upload(self, image):
+        response = self.client.post(
+            reverse("train_station:train-upload-image", args=[self.train.id]),
+            {"image": image},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def listed_variants(self):
+        response = self.client.get(reverse("train_station:train-list"))
+        return response.data["results"][0]["image_variants"]
+
+    def test_upload_creates_variants_in_background(self):
+        self.upload(make_upload())
+        wait_for_variants(timeout=30)
+
+        variants = self.listed_variants()
+        self.assertEqual(set(variants), {"thumbnail", "medium"})
+        self.assertTrue(variants["medium"].startswith("http://testserver/"))
+        self.assertTrue(variants["medium"].endswith("-medium.webp"))
+
+    def test_new_upload_drops_old_variants(self):
+        self.upload(make_upload())
+        wait_for_variants(timeout=30)
+        old = Train.objects.get(pk=self.train.pk).image_variants
+
+        self.upload(make_upload("new.png", image_format="PNG"))
+        self.assertFalse(
+            set(old.values())
+            & set(Train.objects.get(pk=self.train.pk).image_variants.values())
+        )
+        self.assertFalse(
+            any(default_storage.exists(name) for name in old.values())
+        )
+
+        wait_for_variants(timeout=30)
+        train = Train.objects.get(pk=self.train.pk)
+        self.assertFalse(missing_variants(train))
+        self.assertTrue(
+            self.listed_variants()["medium"].endswith(
+                variant_name(train.image.name, "medium")
+            )
+        )
+
+    def test_clearing_image_drops_variants(self):
+        self.upload(make_upload())
+        wait_for_variants(timeout=30)
+        old = Train.objects.get(pk=self.train.pk).image_variants
+
+        self.upload("")
+
+        self.assertEqual(
+            Train.objects.get(pk=self.train.pk).image_variants, {}
+        )
+        self.assertEqual(self.listed_variants(), {})
+        self.assertFalse(
+            any(default_storage.exists(name) for name in old.values())
+        )
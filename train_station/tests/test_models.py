@@ -202,3 +202,50 @@ class JourneyTestCase(TestCase):
             f"{self.route} ({journey.departure_time}"
             f" - {journey.arrival_time})",
         )
+
+
+class JourneyTicketsSoldTestCase(TestCase):
+    def setUp(self):
+        source = Station.objects.create(
+            name="Source", latitude=51.50, longitude=-0.12
+        )
+        destination = Station.objects.create(
+            name="Destination", latitude=48.85, longitude=2.35
+        )
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=source, destination=destination, distance=200
+            ),
+            train=Train.objects.create(
+                name="Train D",
+                cargo_num=2,
+                places_in_cargo=10,
+                train_type=TrainType.objects.create(name="Local"),
+            ),
+            departure_time=timezone.now() + timezone.timedelta(hours=1),
+            arrival_time=timezone.now() + timezone.timedelta(hours=3),
+        )
+        self.order = Order.objects.create(
+            user=CustomUser.objects.create_user(
+                email="testuser@example.com", password="password123"
+            )
+        )
+
+    def test_counter_follows_ticket_creation(self):
+        Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journey, order=self.order
+        )
+        Ticket.objects.create(
+            cargo=1, seat=2, journey=self.journey, order=self.order
+        )
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 2)
+        self.assertEqual(self.journey.tickets_available, 18)
+
+    def test_counter_follows_cascade_delete(self):
+        Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journey, order=self.order
+        )
+        self.order.delete()
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 0)
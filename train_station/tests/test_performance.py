@@ -0,0 +1,25 @@
+from rest_framework.test import APITestCase
+
+from train_station.performance import ENDPOINTS, build_context, count_queries
+from train_station.synthetic import seed_timetable
+
+
+class EndpointQueryBudgetTest(APITestCase):
+    """Requests against a few thousand tickets stay within the query
+    budgets of ``train_station.performance.ENDPOINTS``."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed_timetable(
+            stations=20, journeys=300, tickets_per_journey=10
+        )["user"]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.context = build_context(self.user)
+
+    def test_query_budgets(self):
+        for endpoint in ENDPOINTS:
+            with self.subTest(endpoint.name):
+                queries = count_queries(self.client, endpoint, self.context)
+                self.assertLessEqual(queries, endpoint.max_queries)
@@ -0,0 +1,154 @@
+import math
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from train_station import replicas
+from train_station.cache import get_response_cache
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Journey,
+)
+from train_station.replicas import ReplicaRouter, use_database
+from user.models import CustomUser
+
+
+@override_settings(
+    REPLICA_DATABASES=["replica1", "replica2"],
+    REPLICA_STICKY_SECONDS=5,
+    REPLICA_LAG_CHECK_SECONDS=60,
+)
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        replicas._lag_checks.clear()
+        self.router = ReplicaRouter()
+
+    def test_reads_follow_the_current_database(self):
+        self.assertIsNone(self.router.db_for_read(Journey))
+        with use_database("replica1"):
+            self.assertEqual(self.router.db_for_read(Journey), "replica1")
+            self.assertEqual(self.router.db_for_write(Journey), "default")
+        self.assertIsNone(self.router.db_for_read(Journey))
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(
+            self.router.allow_migrate("replica1", "train_station")
+        )
+        self.assertIsNone(
+            self.router.allow_migrate("default", "train_station")
+        )
+
+    def test_lagging_replicas_are_skipped(self):
+        lags = {"replica1": 0.5, "replica2": math.inf}
+        with mock.patch.object(
+            replicas, "measure_lag", side_effect=lags.get
+        ) as measure_lag:
+            self.assertEqual(replicas.fresh_replicas(), ["replica1"])
+            self.assertEqual(replicas.fresh_replicas(), ["replica1"])
+        self.assertEqual(measure_lag.call_count, 2)
+
+
+@override_settings(REPLICA_DATABASES=["mirror"])
+class ReplicaReadMixinTest(APITransactionTestCase):
+    """The only replica is the ``mirror`` test alias, which reads the
+    default test database through its own connection; test data must be
+    committed for it to see them."""
+
+    databases = {"default", "mirror"}
+
+    def setUp(self):
+        cache.clear()
+        get_response_cache().clear()
+        replicas._lag_checks.clear()
+        source = Station.objects.create(
+            name="Source", latitude=51.50, longitude=-0.12
+        )
+        destination = Station.objects.create(
+            name="Destination", latitude=48.85, longitude=2.35
+        )
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=source, destination=destination, distance=200
+            ),
+            train=Train.objects.create(
+                name="Train A",
+                cargo_num=2,
+                places_in_cargo=10,
+                train_type=TrainType.objects.create(name="Local"),
+            ),
+            departure_time=timezone.now() + timedelta(hours=1),
+            arrival_time=timezone.now() + timedelta(hours=3),
+        )
+        self.user = CustomUser.objects.create_user(
+            email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+
+    def get_read_database(self, response):
+        return response.renderer_context["view"].read_database
+
+    def test_list_and_retrieve_use_replica(self):
+        response = self.client.get(reverse("train_station:journey-list"))
+        self.assertEqual(self.get_read_database(response), "mirror")
+        response = self.client.get(
+            reverse("train_station:journey-detail", args=[self.journey.id])
+        )
+        self.assertEqual(self.get_read_database(response), "mirror")
+        self.assertIsNone(replicas.current_read_database.get())
+
+    def test_responses_cached_from_replica_expire_quickly(self):
+        response_cache = get_response_cache()
+        url = reverse("train_station:station-list")
+        with mock.patch.object(
+            response_cache, "set", wraps=response_cache.set
+        ) as cache_set:
+            response = self.client.get(url)
+        self.assertEqual(self.get_read_database(response), "mirror")
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(cache_set.call_args.args[2], 5)
+
+    def test_other_actions_use_primary(self):
+        response = self.client.get(
+            reverse("train_station:journey-search"),
+            {
+                "origin": self.journey.route.source_id,
+                "destination": self.journey.route.destination_id,
+            },
+        )
+        self.assertIsNone(self.get_read_database(response))
+
+    def test_reads_after_write_stick_to_primary(self):
+        url = reverse("train_station:order-list")
+        response = self.client.post(
+            url,
+            {"tickets": [{"cargo": 1, "seat": 1, "journey": self.journey.id}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(url)
+        self.assertIsNone(self.get_read_database(response))
+        self.assertEqual(len(response.data["results"]), 1)
+
+        self.client.force_authenticate(None)
+        response = self.client.get(reverse("train_station:journey-list"))
+        self.assertEqual(self.get_read_database(response), "mirror")
+
+    def test_failed_write_does_not_stick(self):
+        url = reverse("train_station:order-list")
+        response = self.client.post(
+            url,
+            {"tickets": [{"cargo": 9, "seat": 1, "journey": self.journey.id}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url)
+        self.assertEqual(self.get_read_database(response), "mirror")
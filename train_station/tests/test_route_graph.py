@@ -0,0 +1,63 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from train_station.models import Station
+from train_station.route_graph import RouteGraph
+
+STATIONS = [
+    (1, "Kyiv", 50.45, 30.52),
+    (2, "Zhytomyr", 50.25, 28.66),
+    (3, "Rivne", 50.62, 26.25),
+    (4, "Lviv", 49.84, 24.03),
+    (5, "Odesa", 46.48, 30.72),
+]
+ROUTES = [
+    (10, 1, 2, 140),
+    (11, 2, 3, 190),
+    (12, 3, 4, 210),
+    (13, 1, 4, 600),
+    (14, 1, 5, 480),
+]
+
+
+class RouteGraphTest(SimpleTestCase):
+    def check_paths(self):
+        graph = RouteGraph(STATIONS, ROUTES)
+        path = graph.shortest_path(1, 4)
+        self.assertEqual(path["distance"], 540)
+        self.assertEqual(
+            [station["name"] for station in path["stations"]],
+            ["Kyiv", "Zhytomyr", "Rivne", "Lviv"],
+        )
+        self.assertEqual(path["routes"], [10, 11, 12])
+        self.assertEqual(graph.shortest_path(1, 1)["distance"], 0)
+        # Routes are directed.
+        self.assertIsNone(graph.shortest_path(4, 1))
+        self.assertIsNone(graph.shortest_path(1, 99))
+        return graph
+
+    def test_all_pairs_memoizes_trees(self):
+        graph = self.check_paths()
+        self.assertTrue(graph.all_pairs)
+        self.assertIn(graph.index[1], graph._trees)
+
+    @override_settings(ROUTE_GRAPH_ALL_PAIRS_MAX=2)
+    def test_a_star(self):
+        graph = self.check_paths()
+        self.assertFalse(graph.all_pairs)
+        self.assertGreater(graph.heuristic_scale, 0)
+        self.assertEqual(graph._trees, {})
+
+
+class RouteGraphInvalidationTest(TestCase):
+    def test_invalidated_once_the_change_commits(self):
+        with mock.patch(
+            "train_station.signals.invalidate_route_graph"
+        ) as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                Station.objects.create(
+                    name="Kyiv", latitude=50.45, longitude=30.52
+                )
+                invalidate.assert_not_called()
+            invalidate.assert_called()
@@ -0,0 +1,112 @@
+import base64
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Journey,
+    Order,
+    Ticket,
+)
+from train_station.seat_map import (
+    SeatMap,
+    get_seat_map,
+    seat_map_cache_key,
+)
+from user.models import CustomUser
+
+
+class SeatMapTest(TestCase):
+    def test_take_and_release(self):
+        seat_map = SeatMap(cargo_num=3, places_in_cargo=5)
+        seat_map.take(2, 5)
+        self.assertTrue(seat_map.is_taken(2, 5))
+        self.assertFalse(seat_map.is_taken(3, 1))
+        self.assertEqual(seat_map.taken_count(), 1)
+        seat_map.release(2, 5)
+        self.assertEqual(seat_map.taken_count(), 0)
+
+    def test_free_seats_skips_taken(self):
+        seat_map = SeatMap(cargo_num=2, places_in_cargo=3)
+        for seat in range(1, 4):
+            seat_map.take(1, seat)
+        seat_map.take(2, 2)
+        self.assertEqual(list(seat_map.free_seats()), [(2, 1), (2, 3)])
+
+    def test_allocate_prefers_adjacent_seats(self):
+        seat_map = SeatMap(cargo_num=2, places_in_cargo=4)
+        seat_map.take(1, 2)
+        self.assertEqual(seat_map.allocate(3), [(2, 1), (2, 2), (2, 3)])
+        self.assertEqual(seat_map.allocate(3), [(1, 1), (1, 3), (1, 4)])
+        self.assertIsNone(seat_map.allocate(2))
+
+    def test_representation_bit_order(self):
+        seat_map = SeatMap(cargo_num=2, places_in_cargo=5)
+        seat_map.take(1, 1)
+        seat_map.take(2, 5)
+        data = seat_map.to_representation()
+        self.assertEqual(
+            base64.b64decode(data["bitmap"]), bytes([0b10000000, 0b01000000])
+        )
+
+
+class SeatMapCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        source = Station.objects.create(
+            name="Source", latitude=51.50, longitude=-0.12
+        )
+        destination = Station.objects.create(
+            name="Destination", latitude=48.85, longitude=2.35
+        )
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=source, destination=destination, distance=200
+            ),
+            train=Train.objects.create(
+                name="Train A",
+                cargo_num=2,
+                places_in_cargo=10,
+                train_type=TrainType.objects.create(name="Local"),
+            ),
+            departure_time=timezone.now() + timezone.timedelta(hours=1),
+            arrival_time=timezone.now() + timezone.timedelta(hours=3),
+        )
+        self.order = Order.objects.create(
+            user=CustomUser.objects.create_user(
+                email="testuser@example.com", password="password123"
+            )
+        )
+
+    def test_cached_map_is_invalidated_by_new_ticket(self):
+        self.assertEqual(get_seat_map(self.journey).taken_count(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                cargo=2, seat=3, journey=self.journey, order=self.order
+            )
+        self.journey.refresh_from_db()
+        self.assertTrue(get_seat_map(self.journey).is_taken(2, 3))
+        with self.assertNumQueries(0):
+            get_seat_map(self.journey)
+
+    def test_map_built_before_a_sale_is_not_served_after_it(self):
+        stale = Journey.objects.get(pk=self.journey.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                cargo=1, seat=1, journey=self.journey, order=self.order
+            )
+        # A reader that loaded the journey before the sale caches its map
+        # only after the sale has committed.
+        cache.set(
+            seat_map_cache_key(stale),
+            bytes(SeatMap(2, 10).bits),
+            60,
+        )
+
+        self.journey.refresh_from_db()
+        self.assertTrue(get_seat_map(self.journey).is_taken(1, 1))
@@ -1,4 +1,8 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
 
 from train_station.models import (
     TrainType,
@@ -17,6 +21,8 @@ from train_station.serializers import (
     RouteSerializer,
     CrewSerializer,
     JourneySerializer,
+    JourneyListSerializer,
+    JourneyListRows,
     TicketSerializer,
     OrderCreateSerializer,
     OrderListSerializer,
@@ -135,6 +141,74 @@ class JourneySerializerTest(TestCase):
         self.assertEqual(data["crew"][0], 7)
 
 
+class JourneyListRowsTest(TestCase):
+    def setUp(self):
+        train = Train.objects.create(
+            name="Express",
+            cargo_num=3,
+            places_in_cargo=40,
+            train_type=TrainType.objects.create(name="Passenger"),
+        )
+        station_a = Station.objects.create(
+            name="Station A", latitude=50.45, longitude=30.52
+        )
+        station_b = Station.objects.create(
+            name="Station B", latitude=50.46, longitude=30.53
+        )
+        crew = [
+            Crew.objects.create(first_name="John", last_name="Doe"),
+            Crew.objects.create(first_name="Jane", last_name="Roe"),
+        ]
+        order = Order.objects.create(
+            user=CustomUser.objects.create_user(
+                email="testuser@example.com", password="testpassword"
+            )
+        )
+        for hours, route in enumerate(
+            [
+                Route.objects.create(
+                    source=station_a, destination=station_b, distance=100
+                ),
+                Route.objects.create(
+                    source=station_b, destination=station_a, distance=100
+                ),
+            ],
+            start=1,
+        ):
+            journey = Journey.objects.create(
+                route=route,
+                train=train,
+                departure_time=timezone.now() + timedelta(hours=hours),
+                arrival_time=timezone.now() + timedelta(hours=hours + 1),
+            )
+            journey.crew.set(crew[:hours])
+            Ticket.objects.create(
+                cargo=1, seat=hours, journey=journey, order=order
+            )
+        Journey.objects.create(
+            route=route,
+            train=train,
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=1),
+        )
+
+    def test_renders_same_json_as_list_serializer(self):
+        journeys = (
+            Journey.objects.order_by("id")
+            .select_related("route__source", "route__destination", "train")
+            .prefetch_related("crew")
+        )
+        expected = JourneyListSerializer(journeys, many=True).data
+        with self.assertNumQueries(2):
+            data = JourneyListRows(
+                Journey.objects.order_by("id").values(*JourneyListRows.fields)
+            ).data
+        self.assertEqual(
+            JSONRenderer().render(data), JSONRenderer().render(expected)
+        )
+        self.assertEqual(data[1]["crew"], ["John Doe", "Jane Roe"])
+
+
 class TicketSerializerTest(TestCase):
     def setUp(self):
         self.source = Station.objects.create(
@@ -220,6 +294,59 @@ class OrderSerializerTest(TestCase):
         self.assertEqual(data["tickets"][0]["train"], self.train.name)
 
 
+class TicketListSerializerQueriesTest(TestCase):
+    def setUp(self):
+        source = Station.objects.create(
+            name="Source", latitude=12.34, longitude=56.78
+        )
+        destination = Station.objects.create(
+            name="Destination", latitude=23.45, longitude=67.89
+        )
+        route = Route.objects.create(
+            source=source, destination=destination, distance=100
+        )
+        train = Train.objects.create(
+            name="Train A",
+            cargo_num=10,
+            places_in_cargo=100,
+            train_type=TrainType.objects.create(name="Freight"),
+        )
+        self.journeys = [
+            Journey.objects.create(
+                route=route,
+                train=train,
+                departure_time=timezone.now() + timedelta(hours=hours),
+                arrival_time=timezone.now() + timedelta(hours=hours + 2),
+            )
+            for hours in (1, 5)
+        ]
+
+    def order_data(self, count):
+        return {
+            "tickets": [
+                {
+                    "cargo": 1 + i % 10,
+                    "seat": 1 + i // 10,
+                    "journey": self.journeys[i % 2].id,
+                }
+                for i in range(count)
+            ]
+        }
+
+    def test_validation_query_count_is_constant(self):
+        for count in (1, 40):
+            serializer = OrderCreateSerializer(data=self.order_data(count))
+            with self.assertNumQueries(3):
+                self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_unknown_journey_is_reported(self):
+        serializer = OrderCreateSerializer(
+            data={"tickets": [{"cargo": 1, "seat": 1, "journey": 0}]}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("journey", serializer.errors["tickets"][0])
+
+
 class OrderCreateSerializerTest(TestCase):
     def setUp(self):
         self.user = CustomUser.objects.create_user(
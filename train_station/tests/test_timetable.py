@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from train_station.models import Station
+from train_station.timetable import Timetable
+
+START = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+
+
+def at(hours):
+    return START + timedelta(hours=hours)
+
+
+class TimetableSearchTest(SimpleTestCase):
+    def setUp(self):
+        # Stations: 1 = A, 2 = B, 3 = C, 4 = D
+        self.timetable = Timetable(
+            sorted(
+                [
+                    (10, 1, 4, at(0), at(10)),  # slow direct A -> D
+                    (11, 1, 2, at(1), at(2)),  # A -> B
+                    (12, 2, 4, at(2.5), at(6)),  # B -> D
+                    (13, 2, 3, at(2.5), at(3)),  # B -> C
+                    (14, 3, 4, at(3.5), at(4)),  # C -> D
+                    (15, 2, 4, at(2.05), at(3)),  # too tight to catch
+                ],
+                key=lambda row: row[3],
+            ),
+            {1: "A", 2: "B", 3: "C", 4: "D"},
+        )
+
+    def journeys(self, itineraries):
+        return [
+            [leg["journey"] for leg in itinerary["legs"]]
+            for itinerary in itineraries
+        ]
+
+    def test_direct_and_transfer_itineraries(self):
+        itineraries = self.timetable.search(1, 4, at(0), at(2))
+        self.assertEqual(
+            self.journeys(itineraries), [[10], [11, 12], [11, 13, 14]]
+        )
+        self.assertEqual(itineraries[2]["transfers"], 2)
+        self.assertEqual(itineraries[2]["arrival_time"], at(4))
+        self.assertEqual(itineraries[1]["legs"][0]["destination"], "B")
+
+    def test_max_transfers(self):
+        itineraries = self.timetable.search(
+            1, 4, at(0), at(2), max_transfers=0
+        )
+        self.assertEqual(self.journeys(itineraries), [[10]])
+
+    def test_departure_window(self):
+        itineraries = self.timetable.search(1, 4, at(0.5), at(2))
+        self.assertEqual(self.journeys(itineraries), [[11, 12], [11, 13, 14]])
+
+    def test_min_transfer_time(self):
+        itineraries = self.timetable.search(
+            1, 4, at(0.5), at(2), min_transfer=timedelta(minutes=1)
+        )
+        self.assertEqual(self.journeys(itineraries), [[11, 15]])
+
+    def test_unknown_station(self):
+        self.assertEqual(self.timetable.search(1, 99, at(0), at(2)), [])
+
+
+class TimetableInvalidationTest(TestCase):
+    def test_invalidated_once_the_change_commits(self):
+        with mock.patch(
+            "train_station.signals.invalidate_timetable"
+        ) as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                Station.objects.create(
+                    name="Kyiv", latitude=50.45, longitude=30.52
+                )
+                invalidate.assert_not_called()
+            invalidate.assert_called()
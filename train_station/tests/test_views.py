@@ -1,11 +1,23 @@
+import asyncio
+import csv
+import io
+import json
+import warnings
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection
+from django.test import override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
+from drf_spectacular.drainage import GENERATOR_STATS
+from drf_spectacular.generators import SchemaGenerator
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
 
+from train_station.cache import get_response_cache
 from train_station.models import (
     TrainType,
     Train,
@@ -15,6 +27,7 @@ from train_station.models import (
     Journey,
     Order,
     Ticket,
+    SeatHold,
 )
 from user.models import CustomUser
 
@@ -103,6 +116,26 @@ class RouteViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["count"], 1)
 
+    def test_shortest_route(self):
+        station3 = Station.objects.create(
+            name="Station C", latitude=50.47, longitude=30.54
+        )
+        Route.objects.create(
+            source=self.station2, destination=station3, distance=50
+        )
+        url = reverse("train_station:route-shortest")
+        response = self.client.get(
+            url, {"source": self.station1.id, "destination": station3.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["distance"], 150)
+        self.assertEqual(len(response.data["routes"]), 2)
+
+        response = self.client.get(
+            url, {"source": station3.id, "destination": self.station1.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_create_route(self):
         station3 = Station.objects.create(
             name="Station C", latitude=22.45, longitude=10.52
@@ -119,6 +152,33 @@ class RouteViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Route.objects.count(), 2)
 
+    def test_bulk_upsert_routes(self):
+        self.client.force_authenticate(
+            CustomUser.objects.create_user(
+                email="staff@example.com", password="password", is_staff=True
+            )
+        )
+        data = [
+            {
+                "source": self.station1.id,
+                "destination": self.station2.id,
+                "distance": 120,
+            },
+            {
+                "source": self.station2.id,
+                "destination": self.station1.id,
+                "distance": 110,
+            },
+        ]
+        response = self.client.post(
+            reverse("train_station:route-bulk"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["id"], self.route.id)
+        self.assertEqual(
+            set(Route.objects.values_list("distance", flat=True)), {120, 110}
+        )
+
 
 class JourneyViewSetTests(APITestCase):
     def setUp(self):
@@ -153,6 +213,121 @@ class JourneyViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(int(response.data["count"]), 1)
 
+    def test_list_journeys_tickets_available(self):
+        order = Order.objects.create(
+            user=CustomUser.objects.create_user(
+                email="testuser@example.com", password="testpassword"
+            )
+        )
+        Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journey, order=order
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["results"][0]["tickets_available"], 249)
+
+    def create_journeys(self, count):
+        for hours in range(3, 3 + count):
+            Journey.objects.create(
+                route=self.route,
+                train=self.train,
+                departure_time=timezone.now() + timedelta(hours=hours),
+                arrival_time=timezone.now() + timedelta(hours=hours + 1),
+            )
+
+    def test_list_journeys_with_cursor(self):
+        self.create_journeys(6)
+        response = self.client.get(self.url, {"pagination": "cursor"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(response.data["results"][0]["id"], self.journey.id)
+        first_page = [journey["id"] for journey in response.data["results"]]
+
+        response = self.client.get(response.data["next"])
+        second_page = [journey["id"] for journey in response.data["results"]]
+        self.assertEqual(len(first_page) + len(second_page), 7)
+        self.assertFalse(set(first_page) & set(second_page))
+        self.assertIsNone(response.data["next"])
+
+    def test_list_journeys_without_count(self):
+        self.create_journeys(6)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"count": "false"})
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIn("offset=5", response.data["next"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next"])
+
+    def test_filter_journeys(self):
+        station3 = Station.objects.create(
+            name="Station C", latitude=50.47, longitude=30.54
+        )
+        other_route = Route.objects.create(
+            source=self.station2, destination=station3, distance=50
+        )
+        later = Journey.objects.create(
+            route=other_route,
+            train=self.train,
+            departure_time=timezone.now() + timedelta(days=2),
+            arrival_time=timezone.now() + timedelta(days=2, hours=1),
+        )
+
+        def ids(params):
+            response = self.client.get(self.url, params)
+            return [journey["id"] for journey in response.data["results"]]
+
+        self.assertEqual(ids({"route": other_route.id}), [later.id])
+        self.assertEqual(ids({"source": self.station1.id}), [self.journey.id])
+        self.assertEqual(ids({"destination": station3.id}), [later.id])
+        self.assertEqual(
+            ids(
+                {
+                    "departure_after": (
+                        timezone.now() + timedelta(days=1)
+                    ).isoformat(),
+                }
+            ),
+            [later.id],
+        )
+        self.assertEqual(
+            ids({"date": later.departure_time.date().isoformat()}),
+            [later.id],
+        )
+
+    def test_search_journeys_with_transfer(self):
+        station3 = Station.objects.create(
+            name="Station C", latitude=50.47, longitude=30.54
+        )
+        connection = Journey.objects.create(
+            route=Route.objects.create(
+                source=self.station2, destination=station3, distance=50
+            ),
+            train=self.train,
+            departure_time=self.journey.arrival_time + timedelta(minutes=30),
+            arrival_time=self.journey.arrival_time + timedelta(hours=1),
+        )
+        response = self.client.get(
+            reverse("train_station:journey-search"),
+            {"origin": self.station1.id, "destination": station3.id},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["transfers"], 1)
+        self.assertEqual(
+            [leg["journey"] for leg in response.data[0]["legs"]],
+            [self.journey.id, connection.id],
+        )
+
+    def test_retrieve_journey_compact_seat_map(self):
+        url = reverse("train_station:journey-detail", args=[self.journey.id])
+        response = self.client.get(url, {"seats": "compact"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("taken_places", response.data)
+        self.assertEqual(response.data["seat_map"]["encoding"], "bitmap")
+        self.assertEqual(response.data["seat_map"]["cargo_num"], 5)
+
     def test_create_journey(self):
         data = {
             "route": self.route.id,
@@ -165,6 +340,103 @@ class JourneyViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Journey.objects.count(), 2)
 
+    def bulk_payload(self, count):
+        departure = timezone.now() + timedelta(days=1)
+        return [
+            {
+                "route": self.route.id,
+                "train": self.train.id,
+                "departure_time": departure + timedelta(hours=index),
+                "arrival_time": departure + timedelta(hours=index + 1),
+                "crew": [self.crew.id],
+            }
+            for index in range(count)
+        ]
+
+    def authenticate_staff(self):
+        self.client.force_authenticate(
+            CustomUser.objects.create_user(
+                email="staff@example.com", password="password", is_staff=True
+            )
+        )
+
+    def test_bulk_upsert_journeys(self):
+        self.authenticate_staff()
+        other_crew = Crew.objects.create(first_name="Jane", last_name="Roe")
+        data = self.bulk_payload(2) + [
+            {
+                "route": self.route.id,
+                "train": self.train.id,
+                "departure_time": self.journey.departure_time,
+                "arrival_time": self.journey.arrival_time + timedelta(hours=1),
+                "crew": [other_crew.id],
+            }
+        ]
+        response = self.client.post(
+            reverse("train_station:journey-bulk"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Journey.objects.count(), 3)
+        self.assertEqual(response.data[2]["id"], self.journey.id)
+        self.assertEqual(response.data[0]["crew"], [self.crew.id])
+
+        updated = Journey.objects.get(pk=self.journey.pk)
+        self.assertEqual(
+            updated.arrival_time,
+            self.journey.arrival_time + timedelta(hours=1),
+        )
+        self.assertGreater(updated.updated_at, self.journey.updated_at)
+        self.assertEqual(list(updated.crew.all()), [other_crew])
+
+    def test_bulk_journey_queries_do_not_grow_with_payload(self):
+        self.authenticate_staff()
+        url = reverse("train_station:journey-bulk")
+        with self.assertNumQueries(9):
+            self.client.post(url, self.bulk_payload(2), format="json")
+        Journey.objects.exclude(pk=self.journey.pk).delete()
+        with self.assertNumQueries(9):
+            self.client.post(url, self.bulk_payload(50), format="json")
+
+    def test_bulk_journeys_report_errors_per_item(self):
+        self.authenticate_staff()
+        data = self.bulk_payload(3)
+        data[1]["train"] = 0
+        data[2]["departure_time"] = data[0]["departure_time"]
+        response = self.client.post(
+            reverse("train_station:journey-bulk"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("train", response.data[1])
+        self.assertEqual(Journey.objects.count(), 1)
+
+        data[1]["train"] = self.train.id
+        response = self.client.post(
+            reverse("train_station:journey-bulk"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data,
+            [
+                {},
+                {},
+                {
+                    "non_field_errors": [
+                        "Another item has the same route, train, "
+                        "departure_time."
+                    ]
+                },
+            ],
+        )
+
+    def test_bulk_journeys_require_staff(self):
+        response = self.client.post(
+            reverse("train_station:journey-bulk"),
+            self.bulk_payload(1),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
 
 class OrderViewSetTests(APITestCase):
     def setUp(self):
@@ -203,6 +475,51 @@ class OrderViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["count"], 0)
 
+    def add_order(self, journeys, tickets_per_journey):
+        order = Order.objects.create(user=self.user)
+        for journey in journeys:
+            for seat in range(1, tickets_per_journey + 1):
+                Ticket.objects.create(
+                    cargo=order.id, seat=seat, journey=journey, order=order
+                )
+        return order
+
+    def add_journey(self, crew_size):
+        journey = Journey.objects.create(
+            route=self.route,
+            train=self.train,
+            departure_time=timezone.now() + timezone.timedelta(days=2),
+            arrival_time=timezone.now() + timezone.timedelta(days=2, hours=2),
+        )
+        for number in range(crew_size):
+            journey.crew.add(
+                Crew.objects.create(first_name=f"Crew{number}", last_name="X")
+            )
+        return journey
+
+    def test_order_queries_do_not_grow_with_order_size(self):
+        small = self.add_order([self.journey], 1)
+        with self.assertNumQueries(4):
+            self.client.get(
+                reverse("train_station:order-detail", args=[small.id])
+            )
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+
+        journeys = [self.add_journey(crew_size) for crew_size in (1, 3, 5)]
+        large = self.add_order(journeys, 4)
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                reverse("train_station:order-detail", args=[large.id])
+            )
+        self.assertEqual(len(response.data["tickets"]), 12)
+        self.assertEqual(
+            len(response.data["tickets"][-1]["journey"]["crew"]), 5
+        )
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 2)
+
     def test_create_order_with_tickets(self):
         order_data = {
             "tickets": [
@@ -219,6 +536,101 @@ class OrderViewSetTests(APITestCase):
         order = Order.objects.last()
         self.assertEqual(order.tickets.count(), 2)
 
+    def test_create_order_with_taken_seat(self):
+        Ticket.objects.create(
+            cargo=1,
+            seat=10,
+            journey=self.journey,
+            order=Order.objects.create(user=self.user),
+        )
+        order_data = {
+            "tickets": [
+                {"cargo": 2, "seat": 20, "journey": self.journey.id},
+                {"cargo": 1, "seat": 10, "journey": self.journey.id},
+            ],
+        }
+        response = self.client.post(self.url, order_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["tickets"][0], {})
+        self.assertEqual(
+            response.data["tickets"][1]["non_field_errors"],
+            ["The fields cargo, journey, seat must make a unique set."],
+        )
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_create_order_with_duplicate_seats(self):
+        order_data = {
+            "tickets": [
+                {"cargo": 1, "seat": 10, "journey": self.journey.id},
+                {"cargo": 1, "seat": 10, "journey": self.journey.id},
+            ],
+        }
+        response = self.client.post(self.url, order_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_create_order_updates_tickets_sold(self):
+        order_data = {
+            "tickets": [
+                {"cargo": 1, "seat": seat, "journey": self.journey.id}
+                for seat in range(1, 6)
+            ],
+        }
+        response = self.client.post(self.url, order_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 5)
+
+    def test_allocate_seats(self):
+        Ticket.objects.create(
+            cargo=1,
+            seat=2,
+            journey=self.journey,
+            order=Order.objects.create(user=self.user),
+        )
+        response = self.client.post(
+            reverse("train_station:order-allocate"),
+            {"journey": self.journey.id, "seats": 3},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(t["cargo"], t["seat"]) for t in response.data["tickets"]],
+            [(1, 3), (1, 4), (1, 5)],
+        )
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 4)
+
+    @skipUnlessDBFeature("has_select_for_update_of")
+    def test_allocate_locks_only_the_journey(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("train_station:order-allocate"),
+                {"journey": self.journey.id, "seats": 1},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        [lock] = [
+            query["sql"]
+            for query in queries.captured_queries
+            if "FOR UPDATE" in query["sql"]
+        ]
+        self.assertIn(
+            "FOR UPDATE OF "
+            + connection.ops.quote_name(Journey._meta.db_table),
+            lock,
+        )
+        self.assertNotIn(Train._meta.db_table, lock.split("FOR UPDATE", 1)[1])
+
+    def test_allocate_more_seats_than_available(self):
+        response = self.client.post(
+            reverse("train_station:order-allocate"),
+            {"journey": self.journey.id, "seats": 1001},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Order.objects.count(), 0)
+
     def test_order_permissions(self):
         other_user = User.objects.create_user(
             email="other@example.com", password="password123"
@@ -227,3 +639,319 @@ class OrderViewSetTests(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["count"], 0)
+
+    def test_export_tickets(self):
+        self.add_order([self.journey], 2)
+        self.client.force_authenticate(
+            User.objects.create_user(
+                email="finance@example.com", password="password", is_staff=True
+            )
+        )
+        url = reverse("train_station:order-export", args=["csv"])
+        response = self.client.get(url, HTTP_ACCEPT="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.reader(io.StringIO(response.getvalue().decode())))
+        self.assertEqual(
+            rows[0][:3], ["order_id", "order_created_at", "user_email"]
+        )
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][2], "testuser@example.com")
+        self.assertEqual(
+            rows[1][9:13], ["Station A", "Station B", "100", "Express 1"]
+        )
+
+        url = reverse("train_station:order-export", args=["ndjson"])
+        response = self.client.get(url, {"created_after": "2000-01-01"})
+        lines = [json.loads(line) for line in response.getvalue().splitlines()]
+        self.assertEqual([line["seat"] for line in lines], [1, 2])
+        self.assertEqual(lines[0]["train_type"], "Express")
+
+        response = self.client.get(url, {"created_before": "2000-01-01"})
+        self.assertEqual(response.getvalue(), b"")
+
+        response = self.client.get(url, {"created_after": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_staff(self):
+        response = self.client.get(
+            reverse("train_station:order-export", args=["csv"])
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=1)
+class ExportASGITests(APITransactionTestCase):
+    """Exports served by Django's ASGI handler, as under uvicorn."""
+
+    def setUp(self):
+        staff = User.objects.create_user(
+            email="finance@example.com", password="password", is_staff=True
+        )
+        journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=Station.objects.create(
+                    name="Station A", latitude=50.45, longitude=30.52
+                ),
+                destination=Station.objects.create(
+                    name="Station B", latitude=50.46, longitude=30.53
+                ),
+                distance=100,
+            ),
+            train=Train.objects.create(
+                name="Express 1",
+                cargo_num=10,
+                places_in_cargo=100,
+                train_type=TrainType.objects.create(name="Express"),
+            ),
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=2),
+        )
+        order = Order.objects.create(user=staff)
+        for seat in (1, 2, 3):
+            Ticket.objects.create(
+                cargo=1, seat=seat, journey=journey, order=order
+            )
+        self.client.force_login(staff)
+        self.session = self.client.cookies["sessionid"].value
+
+    async def asgi_get(self, path):
+        requested = False
+        messages = []
+
+        async def receive():
+            nonlocal requested
+            if requested:
+                # Wait for a disconnect that never comes.
+                await asyncio.Event().wait()
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await ASGIHandler()(
+            {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": b"",
+                "root_path": "",
+                "headers": [
+                    (b"host", b"testserver"),
+                    (b"cookie", f"sessionid={self.session}".encode()),
+                ],
+                "client": ("127.0.0.1", 50000),
+                "server": ("testserver", 80),
+            },
+            receive,
+            send,
+        )
+        return messages
+
+    async def test_export_streams_chunks_under_asgi(self):
+        url = reverse("train_station:order-export", args=["ndjson"])
+        with warnings.catch_warnings():
+            # Emitted when Django reads a sync body into memory first.
+            warnings.filterwarnings(
+                "error", message="StreamingHttpResponse must consume"
+            )
+            start, *body = await self.asgi_get(url)
+
+        self.assertEqual(start["status"], status.HTTP_200_OK)
+        chunks = [message["body"] for message in body if message.get("body")]
+        self.assertEqual(
+            [json.loads(chunk)["seat"] for chunk in chunks], [1, 2, 3]
+        )
+        self.assertFalse(body[-1].get("more_body", False))
+
+
+class SeatHoldViewSetTests(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="testuser@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        station1 = Station.objects.create(
+            name="Station A", latitude=50.45, longitude=30.52
+        )
+        station2 = Station.objects.create(
+            name="Station B", latitude=50.46, longitude=30.53
+        )
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=station1, destination=station2, distance=100
+            ),
+            train=Train.objects.create(
+                name="Express 1",
+                cargo_num=10,
+                places_in_cargo=100,
+                train_type=TrainType.objects.create(name="Express"),
+            ),
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=2),
+        )
+        self.url = reverse("train_station:seathold-list")
+        self.hold_data = {
+            "tickets": [
+                {"cargo": 1, "seat": 1, "journey": self.journey.id},
+                {"cargo": 1, "seat": 2, "journey": self.journey.id},
+            ],
+            "minutes": 5,
+        }
+
+    def test_hold_and_confirm(self):
+        response = self.client.post(self.url, self.hold_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["holds"]), 2)
+
+        response = self.client.post(
+            reverse("train_station:seathold-confirm"), {}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tickets"]), 2)
+        self.assertEqual(SeatHold.objects.count(), 0)
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 2)
+
+    def test_held_seats_cannot_be_ordered_by_others(self):
+        self.client.post(self.url, self.hold_data, format="json")
+        other_user = User.objects.create_user(
+            email="other@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=other_user)
+
+        response = self.client.post(self.url, self.hold_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            reverse("train_station:order-list"),
+            {"tickets": self.hold_data["tickets"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_holds_are_released(self):
+        self.client.post(self.url, self.hold_data, format="json")
+        SeatHold.objects.update(expires_at=timezone.now())
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 0)
+        response = self.client.post(
+            reverse("train_station:seathold-confirm"), {}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        other_user = User.objects.create_user(
+            email="other@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=other_user)
+        response = self.client.post(self.url, self.hold_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = CustomUser.objects.create_user(
+            email="testuser@example.com", password="testpassword"
+        )
+        station1 = Station.objects.create(
+            name="Station A", latitude=50.45, longitude=30.52
+        )
+        station2 = Station.objects.create(
+            name="Station B", latitude=50.46, longitude=30.53
+        )
+        self.route = Route.objects.create(
+            source=station1, destination=station2, distance=100
+        )
+        self.journey = Journey.objects.create(
+            route=self.route,
+            train=Train.objects.create(
+                name="Express 1",
+                cargo_num=10,
+                places_in_cargo=100,
+                train_type=TrainType.objects.create(name="Express"),
+            ),
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=2),
+        )
+        self.url = reverse(
+            "train_station:journey-detail", args=[self.journey.id]
+        )
+
+    def test_unchanged_journey_returns_304(self):
+        response = self.client.get(self.url)
+        self.assertNotIn("Last-Modified", response)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_malformed_journey_pk_returns_404(self):
+        url = reverse("train_station:journey-detail", args=["abc"])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"abc"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_new_ticket_changes_journey_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        Ticket.objects.create(
+            cargo=1,
+            seat=1,
+            journey=self.journey,
+            order=Order.objects.create(user=self.user),
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_journey_list_etag(self):
+        url = reverse("train_station:journey-list")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(
+            url, {"ordering": "arrival_time"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.journey.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_route_etag_follows_station_changes(self):
+        url = reverse("train_station:route-detail", args=[self.route.id])
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.route.source.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.route.source.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class SchemaTests(APITestCase):
+    def test_schema_generates_without_errors(self):
+        GENERATOR_STATS.reset()
+        with GENERATOR_STATS.silence():
+            schema = SchemaGenerator().get_schema(request=None, public=True)
+        self.assertEqual(dict(GENERATOR_STATS._error_cache), {})
+
+        journeys = schema["paths"]["/api/train-station/journeys/"]["get"]
+        self.assertEqual(
+            journeys["responses"]["200"]["content"]["application/json"],
+            {
+                "schema": {
+                    "$ref": "#/components/schemas/PaginatedJourneyListList"
+                }
+            },
+        )
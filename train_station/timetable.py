@@ -0,0 +1,210 @@
+"""In-memory timetable index answering station-to-station searches.
+
+Every journey is one connection (source, destination, departure,
+arrival). Connections are kept in compact arrays sorted by departure and
+scanned once per query with the Connection Scan Algorithm, tracking the
+earliest arrival per station separately for each number of legs.
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from train_station.models import Journey, Station
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+INFINITY = 2**63 - 1
+
+
+def to_timestamp(value: datetime) -> int:
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_timestamp(value: int) -> datetime:
+    return EPOCH + value * MICROSECOND
+
+
+class Timetable:
+    def __init__(self, connections, station_names):
+        """``connections`` are ``(journey_id, source_id, destination_id,
+        departure_time, arrival_time)`` rows sorted by departure.
+        """
+        self.station_ids = list(station_names)
+        self.station_index = {
+            station_id: index
+            for index, station_id in enumerate(self.station_ids)
+        }
+        self.station_names = station_names
+
+        self.journeys = array("q")
+        self.sources = array("l")
+        self.destinations = array("l")
+        self.departures = array("q")
+        self.arrivals = array("q")
+        for journey_id, source, destination, departure, arrival in connections:
+            if (
+                source not in self.station_index
+                or destination not in self.station_index
+            ):
+                continue
+            self.journeys.append(journey_id)
+            self.sources.append(self.station_index[source])
+            self.destinations.append(self.station_index[destination])
+            self.departures.append(to_timestamp(departure))
+            self.arrivals.append(to_timestamp(arrival))
+
+    @classmethod
+    def build(cls) -> "Timetable":
+        now = timezone.now()
+        connections = (
+            Journey.objects.filter(
+                departure_time__gte=now,
+                departure_time__lt=now
+                + timedelta(days=settings.TIMETABLE_INDEX_DAYS),
+            )
+            .order_by("departure_time", "id")
+            .values_list(
+                "id",
+                "route__source_id",
+                "route__destination_id",
+                "departure_time",
+                "arrival_time",
+            )
+        )
+        station_names = dict(Station.objects.values_list("id", "name"))
+        return cls(connections.iterator(chunk_size=5000), station_names)
+
+    def __len__(self):
+        return len(self.journeys)
+
+    def search(
+        self,
+        origin: int,
+        destination: int,
+        departure_after: datetime,
+        departure_before: datetime,
+        max_transfers: int = 2,
+        min_transfer: timedelta = timedelta(minutes=10),
+    ) -> list[dict]:
+        """Return direct journeys leaving ``origin`` within the window and
+        the earliest arriving itinerary for each number of transfers that
+        beats every itinerary with fewer transfers.
+        """
+        if (
+            origin not in self.station_index
+            or destination not in self.station_index
+        ):
+            return []
+        origin = self.station_index[origin]
+        destination = self.station_index[destination]
+        window_end = to_timestamp(departure_before)
+        transfer = min_transfer // MICROSECOND
+        max_legs = max_transfers + 1
+
+        stations = len(self.station_ids)
+        arrival = [[INFINITY] * stations for _ in range(max_legs + 1)]
+        parent = [[-1] * stations for _ in range(max_legs + 1)]
+        best = INFINITY
+        direct = []
+
+        sources, destinations = self.sources, self.destinations
+        departures, arrivals = self.departures, self.arrivals
+        start = bisect_left(departures, to_timestamp(departure_after))
+        for index in range(start, len(departures)):
+            departure = departures[index]
+            if departure > window_end and departure > best:
+                break
+            source = sources[index]
+            target = destinations[index]
+            arrival_time = arrivals[index]
+
+            for legs in range(max_legs, 0, -1):
+                if legs == 1:
+                    reachable = source == origin and departure <= window_end
+                else:
+                    reachable = (
+                        arrival[legs - 1][source] + transfer <= departure
+                    )
+                if reachable and arrival_time < arrival[legs][target]:
+                    arrival[legs][target] = arrival_time
+                    parent[legs][target] = index
+                    if target == destination:
+                        best = min(best, arrival_time)
+
+            if (
+                source == origin
+                and target == destination
+                and departure <= window_end
+            ):
+                direct.append([index])
+
+        itineraries = direct
+        fastest = min(
+            (arrivals[legs[-1]] for legs in direct), default=INFINITY
+        )
+        for legs in range(2, max_legs + 1):
+            if arrival[legs][destination] < fastest:
+                fastest = arrival[legs][destination]
+                itineraries.append(self._trace(parent, legs, destination))
+        return [self._itinerary(legs) for legs in itineraries]
+
+    def _trace(self, parent, legs, station) -> list[int]:
+        path = []
+        for level in range(legs, 0, -1):
+            index = parent[level][station]
+            path.append(index)
+            station = self.sources[index]
+        return path[::-1]
+
+    def _itinerary(self, path) -> dict:
+        legs = [
+            {
+                "journey": self.journeys[index],
+                "source": self.station_names[
+                    self.station_ids[self.sources[index]]
+                ],
+                "destination": self.station_names[
+                    self.station_ids[self.destinations[index]]
+                ],
+                "departure_time": from_timestamp(self.departures[index]),
+                "arrival_time": from_timestamp(self.arrivals[index]),
+            }
+            for index in path
+        ]
+        return {
+            "departure_time": legs[0]["departure_time"],
+            "arrival_time": legs[-1]["arrival_time"],
+            "transfers": len(legs) - 1,
+            "legs": legs,
+        }
+
+
+_timetable = None
+_built_at = 0.0
+_stale = True
+_lock = threading.Lock()
+
+
+def get_timetable() -> Timetable:
+    """Return the process-wide timetable, rebuilding it when it was
+    invalidated or is older than ``TIMETABLE_INDEX_TTL`` seconds.
+    """
+    global _timetable, _built_at, _stale
+    with _lock:
+        expired = time.monotonic() - _built_at > settings.TIMETABLE_INDEX_TTL
+        if _timetable is None or _stale or expired:
+            _stale = False
+            _timetable = Timetable.build()
+            _built_at = time.monotonic()
+        return _timetable
+
+
+def invalidate_timetable() -> None:
+    global _stale
+    _stale = True
@@ -0,0 +1,339 @@
+"""Streaming bulk import of stations, trains, routes and journeys.
+
+Rows are read lazily from CSV or JSON Lines files and handled in chunks.
+Foreign keys are given by natural keys (station and train names, crew
+full names) and resolved through lookup maps loaded once per import, so
+validating a row never touches the database. Rows whose natural key
+already exists are skipped, which makes re-running an interrupted import
+safe. Every chunk is written with ``bulk_create`` in its own transaction.
+
+``bulk_create`` sends no ``post_save`` signals, so the caches those
+signals would have invalidated are invalidated once the import is done.
+"""
+
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from train_station.cache import bump_version
+from train_station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Crew,
+    Journey,
+)
+from train_station.route_graph import invalidate_route_graph
+from train_station.timetable import invalidate_timetable
+
+CHUNK_SIZE = 2000
+
+
+@dataclass
+class ImportResult:
+    kind: str
+    created: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.created + self.skipped + len(self.errors)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_rows(path):
+    """Yield ``(line_number, row)`` from a ``.csv`` or ``.jsonl`` file."""
+    _, extension = os.path.splitext(path)
+    with open(path, newline="", encoding="utf-8") as file:
+        if extension == ".csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        elif extension in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as error:
+                    raise ValueError(f"line {line_number}: {error.msg}.")
+                yield line_number, row
+        else:
+            raise ValueError("expected a .csv or .jsonl file.")
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def required(row, name):
+    value = row.get(name)
+    if value is None or value == "":
+        raise ValidationError(f"Missing {name}.")
+    return value
+
+
+def lookup(mapping, key, label):
+    try:
+        return mapping[key]
+    except KeyError:
+        raise ValidationError(f"Unknown {label} {key!r}.")
+
+
+def parse_time(row, name):
+    value = required(row, name)
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise ValidationError(f"Invalid {name} {value!r}.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def first_pk_by(queryset, *fields):
+    """Map natural keys to the lowest primary key carrying them."""
+    mapping = {}
+    for *key, pk in queryset.order_by("-pk").values_list(*fields, "pk"):
+        mapping[key[0] if len(key) == 1 else tuple(key)] = pk
+    return mapping
+
+
+class Importer:
+    model = None
+
+    def __init__(self):
+        self.existing = self.load_existing()
+
+    def load_existing(self) -> set:
+        raise NotImplementedError
+
+    def build(self, row):
+        """Return an unsaved, validated instance or raise
+        ``ValidationError``.
+        """
+        raise NotImplementedError
+
+    def key(self, instance):
+        raise NotImplementedError
+
+    def create(self, instances) -> None:
+        self.model.objects.bulk_create(instances)
+
+    def run(self, rows, chunk_size=CHUNK_SIZE) -> ImportResult:
+        result = ImportResult(str(self.model._meta.verbose_name_plural))
+        started = time.perf_counter()
+        for chunk in chunked(rows, chunk_size):
+            instances = []
+            for line_number, row in chunk:
+                try:
+                    instance = self.build(row)
+                except ValidationError as error:
+                    result.errors.append(
+                        (line_number, " ".join(error.messages))
+                    )
+                    continue
+                key = self.key(instance)
+                if key in self.existing:
+                    result.skipped += 1
+                    continue
+                self.existing.add(key)
+                instances.append(instance)
+            with transaction.atomic():
+                self.create(instances)
+            result.created += len(instances)
+        result.seconds = time.perf_counter() - started
+        if result.created:
+            self.changed()
+        return result
+
+    def changed(self) -> None:
+        bump_version(self.model)
+
+
+class StationImporter(Importer):
+    model = Station
+
+    def load_existing(self):
+        return set(Station.objects.values_list("name", flat=True))
+
+    def build(self, row):
+        station = Station(
+            name=required(row, "name"),
+            latitude=required(row, "latitude"),
+            longitude=required(row, "longitude"),
+        )
+        station.full_clean(validate_unique=False)
+        return station
+
+    def key(self, station):
+        return station.name
+
+    def changed(self):
+        super().changed()
+        invalidate_timetable()
+        invalidate_route_graph()
+
+
+class TrainImporter(Importer):
+    model = Train
+
+    def __init__(self):
+        super().__init__()
+        self.train_types = first_pk_by(TrainType.objects, "name")
+
+    def load_existing(self):
+        return set(Train.objects.values_list("name", flat=True))
+
+    def train_type(self, name):
+        if name not in self.train_types:
+            self.train_types[name] = TrainType.objects.create(name=name).pk
+            bump_version(TrainType)
+        return self.train_types[name]
+
+    def build(self, row):
+        train = Train(
+            name=required(row, "name"),
+            cargo_num=required(row, "cargo_num"),
+            places_in_cargo=required(row, "places_in_cargo"),
+        )
+        train.full_clean(
+            exclude=["train_type", "image"], validate_unique=False
+        )
+        train.train_type_id = self.train_type(required(row, "train_type"))
+        return train
+
+    def key(self, train):
+        return train.name
+
+
+class RouteImporter(Importer):
+    model = Route
+
+    def __init__(self):
+        super().__init__()
+        self.stations = first_pk_by(Station.objects, "name")
+
+    def load_existing(self):
+        return set(Route.objects.values_list("source_id", "destination_id"))
+
+    def build(self, row):
+        route = Route(
+            source_id=lookup(
+                self.stations, required(row, "source"), "station"
+            ),
+            destination_id=lookup(
+                self.stations, required(row, "destination"), "station"
+            ),
+            distance=required(row, "distance"),
+        )
+        route.full_clean(
+            exclude=["source", "destination"], validate_unique=False
+        )
+        return route
+
+    def key(self, route):
+        return route.source_id, route.destination_id
+
+    def changed(self):
+        super().changed()
+        invalidate_timetable()
+        invalidate_route_graph()
+
+
+class JourneyImporter(Importer):
+    """Journeys are given by their route's ``source`` and ``destination``
+    station names and a ``train`` name. ``crew`` lists full names, either
+    as a JSON list or separated by ``;`` in CSV.
+    """
+
+    model = Journey
+
+    def __init__(self):
+        super().__init__()
+        self.stations = first_pk_by(Station.objects, "name")
+        self.routes = first_pk_by(Route.objects, "source_id", "destination_id")
+        self.trains = first_pk_by(Train.objects, "name")
+        self.crew = {
+            f"{first_name} {last_name}": pk
+            for first_name, last_name, pk in Crew.objects.order_by(
+                "-pk"
+            ).values_list("first_name", "last_name", "pk")
+        }
+
+    def load_existing(self):
+        # Departures in the past do not validate, so older journeys can
+        # never collide with imported ones.
+        return set(
+            Journey.objects.filter(
+                departure_time__gte=timezone.now()
+            ).values_list("route_id", "train_id", "departure_time")
+        )
+
+    def build(self, row):
+        source, destination = required(row, "source"), required(
+            row, "destination"
+        )
+        route = (
+            lookup(self.stations, source, "station"),
+            lookup(self.stations, destination, "station"),
+        )
+        if route not in self.routes:
+            raise ValidationError(
+                f"No route from {source!r} to {destination!r}."
+            )
+        journey = Journey(
+            route_id=self.routes[route],
+            train_id=lookup(self.trains, required(row, "train"), "train"),
+            departure_time=parse_time(row, "departure_time"),
+            arrival_time=parse_time(row, "arrival_time"),
+        )
+        journey.full_clean(exclude=["route", "train"], validate_unique=False)
+
+        names = row.get("crew") or []
+        if isinstance(names, str):
+            names = [name.strip() for name in names.split(";")]
+        journey.crew_ids = {
+            lookup(self.crew, name, "crew member") for name in names if name
+        }
+        return journey
+
+    def key(self, journey):
+        return journey.route_id, journey.train_id, journey.departure_time
+
+    def create(self, journeys):
+        Journey.objects.bulk_create(journeys)
+        Journey.crew.through.objects.bulk_create(
+            [
+                Journey.crew.through(journey_id=journey.pk, crew_id=crew_id)
+                for journey in journeys
+                for crew_id in journey.crew_ids
+            ]
+        )
+
+    def changed(self):
+        super().changed()
+        invalidate_timetable()
+
+
+IMPORTERS = {
+    "stations": StationImporter,
+    "trains": TrainImporter,
+    "routes": RouteImporter,
+    "journeys": JourneyImporter,
+}
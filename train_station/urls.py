@@ -1,6 +1,8 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from train_station import async_views
+from train_station.availability import journey_availability_stream
 from train_station.views import (
     TrainTypeViewSet,
     TrainViewSet,
@@ -9,6 +11,8 @@ from train_station.views import (
     CrewViewSet,
     JourneyViewSet,
     OrderViewSet,
+    SeatHoldViewSet,
+    RouteDailyStatsViewSet,
 )
 
 app_name = "train_station"
@@ -21,6 +25,41 @@ router.register("routes", RouteViewSet)
 router.register("crews", CrewViewSet)
 router.register("journeys", JourneyViewSet)
 router.register("orders", OrderViewSet)
+router.register("holds", SeatHoldViewSet)
+router.register("analytics/route-days", RouteDailyStatsViewSet)
 
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path(
+        "journeys/availability-stream/",
+        journey_availability_stream,
+        name="journey-availability-stream",
+    ),
+    path(
+        "async/journeys/",
+        async_views.journey_list,
+        name="async-journey-list",
+    ),
+    path(
+        "async/journeys/<int:pk>/",
+        async_views.journey_detail,
+        name="async-journey-detail",
+    ),
+    path(
+        "async/stations/",
+        async_views.station_list,
+        name="async-station-list",
+    ),
+    path(
+        "async/stations/<int:pk>/",
+        async_views.station_detail,
+        name="async-station-detail",
+    ),
+    path("async/routes/", async_views.route_list, name="async-route-list"),
+    path(
+        "async/routes/<int:pk>/",
+        async_views.route_detail,
+        name="async-route-detail",
+    ),
+    path("", include(router.urls)),
+]
@@ -1,9 +1,27 @@
-from django.db.models import Count, F
-from rest_framework import viewsets, permissions, status
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.db.models import Prefetch
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import mixins, viewsets, permissions, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from train_station.cache import CachedResponseMixin
+from train_station.conditional import (
+    JourneyConditionalGetMixin,
+    RouteConditionalGetMixin,
+)
+from train_station.exports import (
+    IgnoreClientContentNegotiation,
+    export_tickets,
+    streaming_export,
+)
+from train_station.filters import JourneyFilter, RouteDailyStatsFilter
+from train_station.inventory import confirm_holds
 from train_station.models import (
     TrainType,
     Train,
@@ -12,35 +30,85 @@ from train_station.models import (
     Crew,
     Journey,
     Order,
+    SeatHold,
+    RouteDailyStats,
 )
+from train_station.pagination import JourneyPagination, OrderPagination
+from train_station.replicas import ReplicaReadMixin
+from train_station.route_graph import get_route_graph
 from train_station.serializers import (
     TrainTypeSerializer,
     TrainSerializer,
     TrainListSerializer,
     StationSerializer,
     RouteSerializer,
+    RouteBulkSerializer,
     RouteListSerializer,
     CrewSerializer,
     JourneySerializer,
+    JourneyBulkSerializer,
     JourneyListSerializer,
+    JourneyListRows,
     JourneyDetailSerializer,
+    JourneySeatMapSerializer,
+    JourneySearchSerializer,
+    ItinerarySerializer,
     RouteDetailSerializer,
+    RoutePathSerializer,
+    ShortestRouteQuerySerializer,
     OrderCreateSerializer,
+    OrderAllocateSerializer,
     OrderDetailSerializer,
+    OrderExportQuerySerializer,
     OrderListSerializer,
     TrainImageSerializer,
+    SeatHoldSerializer,
+    SeatHoldCreateSerializer,
+    SeatHoldConfirmSerializer,
+    RouteDailyStatsSerializer,
 )
+from train_station.timetable import get_timetable
+
+
+class BulkUpsertMixin:
+    """``POST .../bulk/`` creates or updates a list of objects at once.
+
+    The viewset maps the ``bulk`` action to a serializer whose list
+    serializer is a ``BulkUpsertListSerializer``. Invalid payloads are
+    rejected as a whole with one error object per item.
+    """
+
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="bulk",
+        permission_classes=[IsAdminUser],
+    )
+    def bulk(self, request):
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=settings.BULK_WRITE_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class TrainTypeViewSet(viewsets.ModelViewSet):
+class TrainTypeViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = TrainType.objects.all()
     serializer_class = TrainTypeSerializer
     search_fields = ["name"]
     ordering_fields = ["name"]
 
 
-class TrainViewSet(viewsets.ModelViewSet):
+class TrainViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Train.objects.all()
+    cache_dependencies = (TrainType,)
     search_fields = ["name", "train_type__name"]
     ordering_fields = ["name", "train_type__name"]
 
@@ -74,15 +142,24 @@ class TrainViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class StationViewSet(viewsets.ModelViewSet):
+class StationViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Station.objects.all()
     serializer_class = StationSerializer
     search_fields = ["name"]
     ordering_fields = ["name"]
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(
+    ReplicaReadMixin,
+    BulkUpsertMixin,
+    RouteConditionalGetMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Route.objects.all()
+    cache_dependencies = (Station,)
     ordering_fields = ["source__name", "destination__name", "distance"]
 
     def get_queryset(self):
@@ -96,21 +173,52 @@ class RouteViewSet(viewsets.ModelViewSet):
             return RouteListSerializer
         elif self.action == "retrieve":
             return RouteDetailSerializer
+        elif self.action == "shortest":
+            return ShortestRouteQuerySerializer
+        elif self.action == "bulk":
+            return RouteBulkSerializer
         else:
             return RouteSerializer
 
     search_fields = ["source__name", "destination__name"]
 
+    @action(methods=["GET"], detail=False, url_path="shortest")
+    def shortest(self, request):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        path = get_route_graph().shortest_path(
+            serializer.validated_data["source"],
+            serializer.validated_data["destination"],
+        )
+        if path is None:
+            return Response(
+                {"detail": "No route between these stations."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(RoutePathSerializer(path).data)
+
 
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     search_fields = ["first_name", "last_name"]
     ordering_fields = ["first_name", "last_name"]
 
 
-class JourneyViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(responses=JourneyListSerializer(many=True))
+)
+class JourneyViewSet(
+    ReplicaReadMixin,
+    BulkUpsertMixin,
+    JourneyConditionalGetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Journey.objects.all()
+    pagination_class = JourneyPagination
+    filterset_class = JourneyFilter
     search_fields = [""]
     ordering_fields = [
         "departure_time",
@@ -120,7 +228,13 @@ class JourneyViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action == "list":
             return JourneyListSerializer
+        elif self.action == "search":
+            return JourneySearchSerializer
+        elif self.action == "bulk":
+            return JourneyBulkSerializer
         elif self.action == "retrieve":
+            if self.request.query_params.get("seats") == "compact":
+                return JourneySeatMapSerializer
             return JourneyDetailSerializer
         else:
             return JourneySerializer
@@ -128,34 +242,57 @@ class JourneyViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        if self.action in ["list", "retrieve"]:
-            queryset = (
-                queryset.select_related(
-                    "route__source", "route__destination", "train__train_type"
-                )
-                .prefetch_related("crew")
-                .annotate(
-                    tickets_available=F("train__cargo_num")
-                    * F("train__places_in_cargo")
-                    - Count("tickets")
-                )
-            )
+        if self.action == "list":
+            return queryset.values(*JourneyListRows.fields)
+        if self.action == "retrieve":
+            queryset = queryset.select_related(
+                "route__source", "route__destination", "train__train_type"
+            ).prefetch_related("crew")
 
         return queryset
 
+    def get_serializer(self, *args, **kwargs):
+        # Lists are rendered from values() rows; JourneyListSerializer
+        # still describes them in the schema (see extend_schema_view).
+        if self.action == "list":
+            return JourneyListRows(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    @action(methods=["GET"], detail=False, url_path="search")
+    def search(self, request):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        itineraries = get_timetable().search(
+            origin=params["origin"],
+            destination=params["destination"],
+            departure_after=params["departure_after"],
+            departure_before=params["departure_before"],
+            max_transfers=params["max_transfers"],
+            min_transfer=timedelta(minutes=params["min_transfer"]),
+        )
+        return Response(ItinerarySerializer(itineraries, many=True).data)
 
-class OrderViewSet(viewsets.ModelViewSet):
+
+class OrderViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderPagination
     ordering_fields = ["created_at"]
+    replica_actions = ("list", "retrieve", "export")
 
     def get_queryset(self):
         queryset = Order.objects.filter(user=self.request.user)
         if self.action in ["list", "retrieve"]:
+            # Tickets and their journeys are fetched once per page, so
+            # the number of queries does not grow with the order sizes.
+            journeys = Journey.objects.select_related(
+                "route__source", "route__destination", "train"
+            )
+            if self.action == "retrieve":
+                journeys = journeys.prefetch_related("crew")
             return queryset.prefetch_related(
-                "tickets__journey__route__source",
-                "tickets__journey__route__destination",
-                "tickets__journey__train",
+                Prefetch("tickets__journey", queryset=journeys)
             )
         return queryset
 
@@ -164,8 +301,96 @@ class OrderViewSet(viewsets.ModelViewSet):
             return OrderListSerializer
         elif self.action == "retrieve":
             return OrderDetailSerializer
+        elif self.action == "allocate":
+            return OrderAllocateSerializer
+        elif self.action == "export":
+            return OrderExportQuerySerializer
         else:
             return OrderCreateSerializer
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @action(methods=["POST"], detail=False, url_path="allocate")
+    def allocate(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path=r"export/(?P<export_format>csv|ndjson)",
+        permission_classes=[IsAdminUser],
+        content_negotiation_class=IgnoreClientContentNegotiation,
+    )
+    def export(self, request, export_format):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        tickets = export_tickets(**serializer.validated_data)
+        # The rows are read after the view has returned, when the
+        # request's database routing no longer applies.
+        if self.read_database:
+            tickets = tickets.using(self.read_database)
+        return streaming_export(
+            tickets,
+            export_format,
+            asynchronous=isinstance(request._request, ASGIRequest),
+        )
+
+
+class SeatHoldViewSet(
+    ReplicaReadMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = SeatHold.objects.all()
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return SeatHold.objects.active().filter(user=self.request.user)
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return SeatHoldCreateSerializer
+        if self.action == "confirm":
+            return SeatHoldConfirmSerializer
+        return SeatHoldSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @action(methods=["POST"], detail=False, url_path="confirm")
+    def confirm(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            order = confirm_holds(
+                request.user, serializer.validated_data.get("holds")
+            )
+        except IntegrityError:
+            return Response(
+                {"detail": "Some of the held seats are no longer available."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if order is None:
+            return Response(
+                {"detail": "No active seat holds to confirm."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            OrderCreateSerializer(order).data, status=status.HTTP_201_CREATED
+        )
+
+
+class RouteDailyStatsViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = RouteDailyStats.objects.select_related(
+        "route__source", "route__destination"
+    ).order_by("date", "route")
+    serializer_class = RouteDailyStatsSerializer
+    permission_classes = [IsAdminUser]
+    filterset_class = RouteDailyStatsFilter
+    ordering_fields = ["date", "tickets_sold", "journeys"]
@@ -97,6 +97,54 @@ DATABASES = {
     }
 }
 
+# Read replicas: DB_REPLICA_HOSTS="host1,host2" adds the aliases replica1,
+# replica2, ... that serve the list/retrieve actions of the API (see
+# train_station/replicas.py). The tests use the "mirror" alias instead (see
+# settings_test.py).
+
+REPLICA_DATABASES = []
+for number, host in enumerate(
+    filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(",")), start=1
+):
+    REPLICA_DATABASES.append(f"replica{number}")
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["train_station.replicas.ReplicaRouter"]
+
+# Users read from the primary for this long after a write, and replicas
+# lagging further behind are not used.
+REPLICA_STICKY_SECONDS = 5
+REPLICA_LAG_CHECK_SECONDS = 2
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory is per process: deployments with several workers should set
+# CACHE_URL to a shared Redis-compatible server (requires the redis package)
+# so that cache invalidation reaches every worker; the production settings
+# refuse to start without it.
+
+if os.environ.get("CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["CACHE_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = 10 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -145,9 +193,19 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": [
+        "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "train_station.fast_json.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "train_station.fast_json.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 5,
@@ -164,6 +222,46 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+SEAT_MAP_CACHE_TIMEOUT = 60 * 60
+
+# Resized WebP copies of uploaded train images: name -> (width, height).
+TRAIN_IMAGE_VARIANTS = {
+    "thumbnail": (160, 120),
+    "medium": (640, 480),
+}
+TRAIN_IMAGE_QUALITY = 80
+TRAIN_IMAGE_WORKERS = 2
+
+# Rows fetched per round trip by the streaming ticket export.
+EXPORT_CHUNK_SIZE = 2000
+
+# Items accepted by one POST to the bulk create/update endpoints.
+BULK_WRITE_MAX_ITEMS = 1000
+
+SEAT_HOLD_MINUTES = 10
+SEAT_HOLD_MAX_MINUTES = 30
+
+# The journey search index is rebuilt per process on local changes and
+# at least every TIMETABLE_INDEX_TTL seconds to pick up other workers' ones.
+TIMETABLE_INDEX_TTL = 5 * 60
+TIMETABLE_INDEX_DAYS = 60
+TIMETABLE_MIN_TRANSFER_MINUTES = 10
+
+# Seat availability event streams need an ASGI server (see asgi.py).
+AVAILABILITY_STREAM_KEEPALIVE = 15
+AVAILABILITY_STREAM_MAX_JOURNEYS = 50
+# Changes reach the streams of every worker process through this Redis
+# server; without it a stream only sees the changes of its own process.
+AVAILABILITY_REDIS_URL = os.environ.get("CACHE_URL")
+
+ROUTE_GRAPH_TTL = 5 * 60
+# Networks up to this many stations memoize every shortest-path tree.
+ROUTE_GRAPH_ALL_PAIRS_MAX = 200
+
+# Route day aggregates re-read journeys updated this many seconds before
+# the newest aggregated change, to catch transactions that committed late.
+ROUTE_STATS_REFRESH_OVERLAP = 5 * 60
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
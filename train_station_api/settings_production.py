@@ -0,0 +1,75 @@
+"""
+Production settings for train_station_api project.
+
+Select them with DJANGO_SETTINGS_MODULE=train_station_api.settings_production
+and serve the project with gunicorn (see gunicorn.conf.py).
+
+Database connections are either pooled (DB_POOL=true, the default) or kept
+open per worker thread for DB_CONN_MAX_AGE seconds. Django does not allow
+both at once. Prefer the pool under the ASGI workers, where requests do not
+stay on one thread, and CONN_MAX_AGE under sync WSGI workers.
+
+CACHE_URL is required: gunicorn runs several worker processes, and the
+response cache versions, ETags, replica pins and seat maps only stay
+consistent when all of them share one cache server.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from train_station_api.settings import *  # noqa: F401,F403
+from train_station_api.settings import DATABASES, INSTALLED_APPS, MIDDLEWARE
+
+SECRET_KEY = os.environ.get("SECRET_KEY")
+if not SECRET_KEY:
+    raise ImproperlyConfigured("Set SECRET_KEY for the production settings.")
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if not middleware.startswith("debug_toolbar.")
+]
+
+
+# Cache
+# The base settings build CACHES from CACHE_URL; refuse the per-process
+# local memory fallback.
+
+if not os.environ.get("CACHE_URL"):
+    raise ImproperlyConfigured(
+        "Set CACHE_URL to the Redis server shared by the gunicorn workers, "
+        "e.g. redis://redis:6379/0."
+    )
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/databases/#connection-pool
+
+for database in DATABASES.values():
+    database["CONN_HEALTH_CHECKS"] = True
+
+    if os.environ.get("DB_POOL", "true").lower() in ("true", "1"):
+        # Requires psycopg 3 with the pool extra (psycopg[pool]). Every
+        # worker process gets a pool per alias, so keep
+        # workers * DB_POOL_MAX_SIZE below the server's max_connections.
+        database["CONN_MAX_AGE"] = 0
+        database["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            }
+        }
+    else:
+        database["CONN_MAX_AGE"] = int(os.environ.get("DB_CONN_MAX_AGE", 60))
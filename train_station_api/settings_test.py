@@ -0,0 +1,16 @@
+"""
+Test settings for train_station_api project.
+
+``manage.py test`` selects them unless DJANGO_SETTINGS_MODULE is set.
+They add the "mirror" alias the replica routing tests read through: it
+reads the default test database with its own connection and is never used
+unless listed in REPLICA_DATABASES.
+"""
+
+from train_station_api.settings import *  # noqa: F401,F403
+from train_station_api.settings import DATABASES
+
+DATABASES["mirror"] = {
+    **DATABASES["default"],
+    "TEST": {"MIRROR": "default"},
+}